@@ -0,0 +1 @@
+"""Benchmarks del núcleo de cálculo con datos de monitoreo sintéticos (``python -m benchmarks``)."""
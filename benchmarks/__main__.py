@@ -0,0 +1,149 @@
+"""Mide el núcleo de cálculo a varios tamaños y guarda los resultados.
+
+    python -m benchmarks                       # tamaños pequeno y mediano
+    python -m benchmarks --tamanos grande -r 3
+
+Cada corrida se guarda en ``benchmarks/resultados/<fecha>.json`` y se compara
+con la corrida anterior; las mediciones más de un 20 % más lentas se marcan.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sinteticos import synthetic_monitoring
+from calidad_aire.cumplimiento import PERIODOS, evaluate_compliance, hourly_grid, period_average
+from calidad_aire.datos import ECA
+from calidad_aire.exportar import write_csv
+from calidad_aire.ingesta import read_monitoring, read_monitoring_csv
+from calidad_aire.tablas import eca_to_df, format_cell
+from calidad_aire.validez import completeness
+
+# nombre → (estaciones, años); cada estación tiene los 11 contaminantes del ECA
+TAMANOS = {
+    "pequeno": (2, 1),
+    "mediano": (10, 1),
+    "grande": (20, 3),
+}
+RESULTADOS = Path(__file__).parent / "resultados"
+UMBRAL_REGRESION = 1.2
+
+
+def medir(fn, repeticiones):
+    """(mínimo, mediana) en segundos de ``repeticiones`` llamadas a ``fn``."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), statistics.median(tiempos)
+
+
+def benchmarks_tablas(repeticiones):
+    """eca_to_df y el formateo de la tabla (no dependen del tamaño de los datos)."""
+    eca_df = eca_to_df(ECA)
+    yield "eca_to_df", lambda: eca_to_df(ECA), repeticiones * 20
+    yield "format_cell", lambda: eca_df.map(format_cell), repeticiones * 20
+
+
+def benchmarks_datos(data, carpeta, repeticiones):
+    csv = carpeta / "datos.csv"
+    write_csv(data, csv)
+    cache = carpeta / "cache"
+    grid = hourly_grid(data)
+
+    def parquet_frio():
+        for archivo in cache.glob("*.parquet"):
+            archivo.unlink()
+        read_monitoring(csv, cache_dir=cache)
+
+    yield "ingesta_csv", lambda: read_monitoring_csv(csv), repeticiones
+    yield "ingesta_parquet_frio", parquet_frio, repeticiones
+    yield "ingesta_parquet_cache", lambda: read_monitoring(csv, cache_dir=cache), repeticiones
+    yield "hourly_grid", lambda: hourly_grid(data), repeticiones
+    yield "promedios", lambda: [period_average(grid, p) for p in PERIODOS], repeticiones
+    yield "completitud", lambda: [completeness(grid, p) for p in PERIODOS], repeticiones
+    yield "evaluate_compliance", lambda: evaluate_compliance(data, ECA), repeticiones
+
+
+def git_commit():
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def ejecutar(tamanos, repeticiones):
+    registros = []
+
+    def registrar(nombre, tamano, filas, fn, reps):
+        minimo, mediana = medir(fn, reps)
+        registros.append({"benchmark": nombre, "tamano": tamano, "filas": filas,
+                          "min_s": minimo, "mediana_s": mediana, "repeticiones": reps})
+        print(f"  {nombre:<24} {tamano:<8} {filas:>11,} filas  "
+              f"mín {minimo * 1e3:10.2f} ms  mediana {mediana * 1e3:10.2f} ms")
+
+    for nombre, fn, reps in benchmarks_tablas(repeticiones):
+        registrar(nombre, "-", len(ECA), fn, reps)
+    for tamano in tamanos:
+        estaciones, anios = TAMANOS[tamano]
+        data = synthetic_monitoring(estaciones, anios)
+        with tempfile.TemporaryDirectory() as carpeta:
+            for nombre, fn, reps in benchmarks_datos(data, Path(carpeta), repeticiones):
+                registrar(nombre, tamano, len(data), fn, reps)
+    return registros
+
+
+def comparar(registros, anterior):
+    """Imprime la razón actual / anterior del tiempo mínimo (el menos ruidoso)."""
+    previos = {(r["benchmark"], r["tamano"]): r["min_s"] for r in anterior["resultados"]}
+    print(f"\nComparación con {anterior['fecha']} ({anterior.get('commit') or 'sin commit'}):")
+    for r in registros:
+        previo = previos.get((r["benchmark"], r["tamano"]))
+        if not previo:
+            continue
+        razon = r["min_s"] / previo
+        marca = "  ← más lento" if razon > UMBRAL_REGRESION else ""
+        print(f"  {r['benchmark']:<24} {r['tamano']:<8} ×{razon:5.2f}{marca}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanos", nargs="+", choices=list(TAMANOS), default=["pequeno", "mediano"])
+    parser.add_argument("-r", "--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", type=Path, default=RESULTADOS, help="carpeta de resultados")
+    args = parser.parse_args(argv)
+
+    args.salida.mkdir(parents=True, exist_ok=True)
+    previos = sorted(args.salida.glob("*.json"))
+    registros = ejecutar(args.tamanos, args.repeticiones)
+    fecha = datetime.now().strftime("%Y%m%d-%H%M%S")
+    corrida = {
+        "fecha": fecha,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "resultados": registros,
+    }
+    destino = args.salida / f"{fecha}.json"
+    destino.write_text(json.dumps(corrida, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados → {destino}")
+    if previos:
+        comparar(registros, json.loads(previos[-1].read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
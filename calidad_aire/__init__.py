@@ -0,0 +1 @@
+"""Núcleo de cálculo del marco normativo de calidad del aire (Perú)."""
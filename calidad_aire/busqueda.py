@@ -0,0 +1,225 @@
+"""Índice invertido persistente sobre los PDF normativos del repositorio.
+
+Cada PDF se divide en artículos ("Artículo N", o por página si el documento
+no tiene artículos) y se guarda en disco la frecuencia de términos de cada
+artículo. Al reconstruir solo se vuelve a extraer el texto de los PDF cuyo
+``mtime`` y SHA-256 cambiaron; la búsqueda (BM25) trabaja en memoria.
+"""
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+# pypdf es opcional: sin él el índice queda vacío
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except Exception:
+    PYPDF_AVAILABLE = False
+
+INDEX_VERSION = 2
+INDEX_FILE = "indice_pdf.json"
+
+# Solo el encabezado ("Artículo 3°.- ..."); las citas en el texto ("el artículo
+# 12 de la Ley ...") no cortan el artículo aunque caigan al inicio de una línea.
+_ARTICULO = re.compile(r"(?m)^[ \t]*(Art[íi]culo\s+\d+)\s*[°º]?\s*\.-")
+_PALABRA = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a al con de del el en es la las lo los o para por que se su sus un una y".split()
+)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def _fold(texto):
+    """Minúsculas sin tildes conservando la longitud (un carácter por carácter)."""
+    return "".join(unicodedata.normalize("NFKD", c)[:1] for c in texto.lower())
+
+
+def tokenize(texto):
+    return [t for t in _PALABRA.findall(_fold(texto)) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_articles(path):
+    """Divide el texto del PDF en unidades ``{"title", "page", "text"}``."""
+    crudo = [page.extract_text() or "" for page in PdfReader(str(path)).pages]
+
+    unidades = []
+    actual = None
+    for num, texto in enumerate(crudo, start=1):
+        pos = 0
+        for match in _ARTICULO.finditer(texto):
+            fragmento = texto[pos:match.start()]
+            if actual is None and fragmento.strip():
+                actual = {"title": "Preámbulo", "page": num, "text": ""}
+            if actual is not None:
+                actual["text"] += fragmento
+                unidades.append(actual)
+            actual = {"title": match.group(1).title(), "page": num, "text": ""}
+            pos = match.start()
+        if actual is None and texto.strip():
+            actual = {"title": "Preámbulo", "page": num, "text": ""}
+        if actual is not None:
+            actual["text"] += texto[pos:] + "\n"
+    if actual is not None:
+        unidades.append(actual)
+
+    if len(unidades) <= 1:
+        # Sin artículos reconocibles: una unidad por página
+        unidades = [
+            {"title": f"Página {num}", "page": num, "text": texto}
+            for num, texto in enumerate(crudo, start=1)
+        ]
+    for unidad in unidades:
+        unidad["text"] = re.sub(r"\s+", " ", unidad["text"]).strip()
+    return [u for u in unidades if u["text"]]
+
+
+class SearchIndex:
+    """Índice de artículos con ranking BM25 y fragmentos resaltados."""
+
+    def __init__(self, documents=None):
+        # {nombre_pdf: {"mtime", "sha256", "units": [{"title", "page", "text", "tf"}]}}
+        self.documents = documents or {}
+        self.dirty = False
+        self._build_postings()
+
+    # --- persistencia -------------------------------------------------
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data["documents"])
+
+    def save(self, path):
+        temporal = f"{path}.tmp"
+        with open(temporal, "w", encoding="utf-8") as fh:
+            json.dump({"version": INDEX_VERSION, "documents": self.documents}, fh, ensure_ascii=False)
+        os.replace(temporal, path)
+        self.dirty = False
+
+    # --- construcción incremental --------------------------------------
+    def update(self, pdf_paths):
+        """Sincroniza el índice con ``pdf_paths``; devuelve los PDF reindexados."""
+        vistos = set()
+        cambiados = []
+        for path in pdf_paths:
+            path = Path(path)
+            nombre = path.name
+            vistos.add(nombre)
+            mtime = path.stat().st_mtime
+            previo = self.documents.get(nombre)
+            if previo is not None and previo["mtime"] == mtime:
+                continue
+            sha = _sha256(path)
+            self.dirty = True
+            if previo is not None and previo["sha256"] == sha:
+                previo["mtime"] = mtime
+                continue
+            units = extract_articles(path) if PYPDF_AVAILABLE else []
+            for unit in units:
+                unit["tf"] = Counter(tokenize(f"{unit['title']} {unit['text']}"))
+            self.documents[nombre] = {"mtime": mtime, "sha256": sha, "units": units}
+            cambiados.append(nombre)
+        eliminados = set(self.documents) - vistos
+        for nombre in eliminados:
+            del self.documents[nombre]
+            self.dirty = True
+        if cambiados or eliminados:
+            self._build_postings()
+        return cambiados
+
+    def _build_postings(self):
+        self._units = []
+        self._postings = {}
+        for nombre, doc in sorted(self.documents.items()):
+            for unit in doc["units"]:
+                uid = len(self._units)
+                self._units.append((nombre, unit, sum(unit["tf"].values())))
+                for term, tf in unit["tf"].items():
+                    self._postings.setdefault(term, []).append((uid, tf))
+        total = sum(length for _, _, length in self._units)
+        self._avg_len = total / len(self._units) if self._units else 0.0
+
+    @property
+    def unindexed(self):
+        """PDF sin texto extraíble (p. ej. escaneados sin OCR)."""
+        return sorted(nombre for nombre, doc in self.documents.items() if not doc["units"])
+
+    # --- consulta --------------------------------------------------------
+    def search(self, query, limit=10, snippet_chars=160):
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._units:
+            return []
+        n_units = len(self._units)
+        scores = Counter()
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_units - len(postings) + 0.5) / (len(postings) + 0.5))
+            for uid, tf in postings:
+                length = self._units[uid][2]
+                norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * length / self._avg_len)
+                scores[uid] += idf * tf * (_BM25_K1 + 1) / (tf + norm)
+
+        resultados = []
+        for uid, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            nombre, unit, _ = self._units[uid]
+            resultados.append({
+                "document": nombre,
+                "title": unit["title"],
+                "page": unit["page"],
+                "score": round(score, 3),
+                "snippet": highlight_snippet(unit["text"], terms, snippet_chars),
+            })
+        return resultados
+
+
+def highlight_snippet(text, terms, width=160):
+    """Fragmento alrededor de la primera coincidencia con los términos en **negrita**."""
+    plegado = _fold(text)
+    patron = re.compile(r"\b(" + "|".join(map(re.escape, terms)) + r")\b")
+    primera = patron.search(plegado)
+    centro = primera.start() if primera else 0
+    inicio = max(0, centro - width // 2)
+    fin = min(len(text), inicio + width)
+    partes = []
+    pos = inicio
+    for match in patron.finditer(plegado, inicio, fin):
+        partes.append(text[pos:match.start()])
+        partes.append(f"**{text[match.start():match.end()]}**")
+        pos = match.end()
+    partes.append(text[pos:fin])
+    prefijo = "…" if inicio > 0 else ""
+    sufijo = "…" if fin < len(text) else ""
+    return prefijo + "".join(partes) + sufijo
+
+
+def load_or_build_index(pdf_dir, cache_dir):
+    """Carga el índice de disco, reindexa los PDF modificados y lo guarda."""
+    ruta = Path(cache_dir) / INDEX_FILE
+    index = SearchIndex.load(ruta)
+    index.update(sorted(Path(pdf_dir).glob("*.pdf")))
+    if index.dirty or not ruta.exists():
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        index.save(ruta)
+    return index
@@ -0,0 +1,166 @@
+"""Línea de comandos para evaluaciones por lotes sin Streamlit.
+
+    python -m calidad_aire evaluar datos/*.csv -o resultados/ --formato parquet
+    python -m calidad_aire eca -o eca.csv
+    python -m calidad_aire en-linea nuevas.csv --checkpoint estado.json
+
+Los módulos de cálculo se importan dentro de cada comando, de modo que
+``--help`` y los errores de argumentos responden sin cargar pandas.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+FORMATOS_SALIDA = ("csv", "parquet", "xlsx")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m calidad_aire",
+        description="Evaluación del cumplimiento de los ECA de aire (Perú).",
+    )
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    evaluar = comandos.add_parser("evaluar", help="evalúa archivos de monitoreo y escribe los resultados")
+    evaluar.add_argument("archivos", nargs="+", type=Path,
+                         help="CSV de monitoreo (timestamp, station, pollutant, value[, unit])")
+    evaluar.add_argument("-o", "--salida", type=Path, required=True, help="directorio de resultados")
+    evaluar.add_argument("--formato", choices=FORMATOS_SALIDA, default="csv")
+    evaluar.add_argument("--historico", action="store_true",
+                         help="comparar con el ECA vigente en la fecha de cada medición")
+    evaluar.add_argument("--promedios", action="store_true",
+                         help="exportar también todos los promedios (puede ser muy grande)")
+    evaluar.add_argument("--workers", type=int, default=None, help="procesos para repartir las estaciones")
+    evaluar.add_argument("--sin-cache", action="store_true", help="no usar la caché Parquet de ingesta")
+    evaluar.set_defaults(func=cmd_evaluar)
+
+    en_linea = comandos.add_parser("en-linea", help="evalúa lecturas nuevas continuando desde un checkpoint")
+    en_linea.add_argument("archivo", type=Path,
+                          help="CSV con las lecturas nuevas (timestamp, station, pollutant, value[, unit])")
+    en_linea.add_argument("--checkpoint", type=Path, required=True,
+                          help="estado JSON; se crea si no existe y se actualiza tras cada bloque")
+    en_linea.add_argument("-o", "--salida", type=Path, default=None,
+                          help="CSV al que se agregan las excedencias (por defecto, la salida estándar)")
+    en_linea.set_defaults(func=cmd_en_linea)
+
+    eca = comandos.add_parser("eca", help="exporta la tabla ECA con valores numéricos y unidades")
+    eca.add_argument("-o", "--salida", type=Path, required=True, help="archivo de salida (.csv, .parquet, .xlsx)")
+    eca.set_defaults(func=cmd_eca)
+    return parser
+
+
+def cmd_evaluar(args):
+    import pandas as pd
+
+    from calidad_aire.config import cache_dir
+    from calidad_aire.datos import ECA, TIMELINE
+    from calidad_aire.exportar import FORMATOS, export_frame
+    from calidad_aire.historico import current_history
+    from calidad_aire.ingesta import (
+        is_parquet_source, load_monitoring, monitoring_source, source_rows, source_stations, unit_errors,
+    )
+    from calidad_aire.lotes import evaluate_network
+
+    inicio = time.perf_counter()
+    faltan = [str(a) for a in args.archivos if not a.is_file()]
+    if faltan:
+        print(f"No existen: {', '.join(faltan)}", file=sys.stderr)
+        return 2
+    cache = None if args.sin_cache else cache_dir("mediciones")
+    # Con la caché Parquet cada lote de estaciones se lee por separado
+    partes = [monitoring_source(archivo, cache_dir=cache) for archivo in args.archivos]
+    for archivo, parte in zip(args.archivos, partes):
+        rechazadas = unit_errors(parte)
+        if len(rechazadas):
+            unidades = ", ".join(map(str, rechazadas["unit"].astype("string").fillna("(vacía)").unique()[:5]))
+            print(f"{archivo}: {len(rechazadas):,} filas omitidas por unidad no convertible ({unidades})",
+                  file=sys.stderr)
+    if len(partes) == 1:
+        data = partes[0]
+    else:
+        data = pd.concat([load_monitoring(p) if is_parquet_source(p) else p for p in partes], ignore_index=True)
+        for col in ("station", "pollutant"):
+            data[col] = data[col].astype("category")
+
+    def progreso(hechas, total, estaciones, _):
+        print(f"  [{hechas}/{total}] {', '.join(map(str, estaciones))}", file=sys.stderr)
+
+    if args.historico:
+        resultado = evaluate_network(data, history=current_history(ECA, TIMELINE), max_workers=args.workers,
+                                     progress=progreso)
+    else:
+        resultado = evaluate_network(data, ECA, max_workers=args.workers, progress=progreso)
+
+    args.salida.mkdir(parents=True, exist_ok=True)
+    extension = FORMATOS[args.formato][1]
+    tablas = {
+        "resumen": resultado.summary,
+        "excedencias": resultado.exceedances,
+        "invalidas": resultado.invalid,
+    }
+    if args.promedios:
+        tablas["promedios"] = resultado.averages
+    for nombre, tabla in tablas.items():
+        export_frame(tabla, args.formato, args.salida / f"{nombre}{extension}")
+
+    print(
+        f"{source_rows(data):,} mediciones, {len(source_stations(data))} estaciones: "
+        f"{len(resultado.exceedances):,} excedencias, {len(resultado.invalid):,} ventanas inválidas "
+        f"({time.perf_counter() - inicio:.1f} s) → {args.salida}"
+    )
+    return 0
+
+
+def cmd_en_linea(args):
+    import pandas as pd
+
+    from calidad_aire.datos import ECA
+    from calidad_aire.en_linea import ExceedanceEvent, OnlineEvaluator
+    from calidad_aire.ingesta import iter_monitoring_chunks
+
+    if not args.archivo.is_file():
+        print(f"No existe: {args.archivo}", file=sys.stderr)
+        return 2
+    evaluador = OnlineEvaluator.load(args.checkpoint, ECA)
+    encabezado = args.salida is None or not args.salida.exists()
+    total = 0
+    for chunk in iter_monitoring_chunks(args.archivo):
+        # El evaluador descarta lecturas anteriores a la última procesada
+        eventos = evaluador.update_frame(chunk.sort_values("timestamp", kind="stable"))
+        evaluador.save(args.checkpoint)
+        if eventos:
+            tabla = pd.DataFrame(eventos, columns=ExceedanceEvent._fields)
+            destino = sys.stdout if args.salida is None else open(args.salida, "a", encoding="utf-8", newline="")
+            try:
+                tabla.to_csv(destino, index=False, header=encabezado)
+            finally:
+                if destino is not sys.stdout:
+                    destino.close()
+            encabezado = False
+            total += len(eventos)
+
+    print(
+        f"{total:,} excedencias, {evaluador.invalid:,} ventanas inválidas, "
+        f"{evaluador.skipped:,} lecturas descartadas → {args.checkpoint}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_eca(args):
+    from calidad_aire.datos import ECA
+    from calidad_aire.exportar import FORMATOS, eca_table, export_frame
+
+    formato = next((f for f, (_, ext) in FORMATOS.items() if args.salida.suffix == ext), None)
+    if formato is None:
+        print(f"Extensión no soportada: {args.salida.suffix!r}", file=sys.stderr)
+        return 2
+    export_frame(eca_table(ECA), formato, args.salida)
+    print(f"ECA → {args.salida}")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
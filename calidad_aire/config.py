@@ -0,0 +1,12 @@
+"""Rutas de trabajo compartidas (cachés en disco)."""
+import os
+from pathlib import Path
+
+CACHE_ROOT = Path(os.environ.get("CALIDAD_AIRE_CACHE", ".cache"))
+
+
+def cache_dir(nombre):
+    """Devuelve (y crea) el subdirectorio de caché ``nombre``."""
+    ruta = CACHE_ROOT / nombre
+    ruta.mkdir(parents=True, exist_ok=True)
+    return ruta
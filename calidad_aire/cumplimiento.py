@@ -0,0 +1,213 @@
+"""Evaluación vectorizada del cumplimiento de los ECA sobre series horarias.
+
+Los datos de monitoreo llegan en formato largo (``timestamp``, ``station``,
+``pollutant``, ``value``) y se pivotan a una rejilla horaria ancha con una
+columna por estación × contaminante. Los promedios de cada periodo del ECA se
+calculan sobre esa rejilla completa con operaciones ``rolling``/``resample``
+de pandas, sin recorrer filas en Python.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from calidad_aire.unidades import CANONICAL_UNIT, eca_units, to_canonical
+from calidad_aire.validez import UMBRAL_COMPLETITUD, completeness
+
+COLUMNAS = ("timestamp", "station", "pollutant", "value")
+PERIODOS = ("1h", "8h", "24h", "anual")
+
+_COLUMNAS_PROMEDIOS = ["timestamp", "station", "pollutant", "period", "value", "limit", "unit", "exceeds"]
+_COLUMNAS_RESUMEN = [
+    "station", "pollutant", "period", "limit", "unit", "source",
+    "n_valid", "n_invalid", "n_exceed", "max_value",
+]
+_COLUMNAS_INVALIDAS = ["timestamp", "station", "pollutant", "period", "value", "completeness"]
+
+
+@dataclass
+class ComplianceResult:
+    """Promedios por periodo (formato largo), resumen de excedencias y
+    ventanas descartadas por completitud insuficiente."""
+
+    averages: pd.DataFrame
+    summary: pd.DataFrame
+    invalid: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=_COLUMNAS_INVALIDAS))
+
+    @property
+    def exceedances(self):
+        return self.averages[self.averages["exceeds"]]
+
+
+def hourly_grid(data):
+    """Pivota mediciones largas a una rejilla horaria completa.
+
+    Devuelve un DataFrame indexado por hora (sin huecos) con columnas
+    ``MultiIndex`` (station, pollutant). Las horas sin dato quedan en NaN y
+    los valores repetidos dentro de la misma hora se promedian.
+    """
+    faltan = [c for c in COLUMNAS if c not in data.columns]
+    if faltan:
+        raise ValueError(f"Faltan columnas en los datos de monitoreo: {faltan}")
+
+    ts = pd.to_datetime(data["timestamp"]).dt.floor("h").rename("timestamp")
+    values = pd.to_numeric(data["value"], errors="coerce")
+    grid = (
+        values.groupby([ts, data["station"], data["pollutant"]], observed=True)
+        .mean()
+        .unstack(["station", "pollutant"])
+        .sort_index(axis=1)
+    )
+    if grid.empty:
+        return grid
+    horas = pd.date_range(grid.index.min(), grid.index.max(), freq="h", name="timestamp")
+    return grid.reindex(horas)
+
+
+def period_average(grid, period):
+    """Promedia la rejilla horaria según el periodo del ECA.
+
+    ``1h`` es el valor horario, ``8h`` la media móvil de 8 horas (etiquetada al
+    final de la ventana), ``24h`` la media del día calendario y ``anual`` la
+    media del año calendario.
+    """
+    if period == "1h":
+        return grid
+    if period == "8h":
+        return grid.rolling(8, min_periods=1).mean()
+    if period == "24h":
+        return grid.resample("D").mean()
+    if period == "anual":
+        return grid.resample("YS").mean()
+    raise ValueError(f"Periodo no soportado: {period!r}")
+
+
+def evaluate_compliance(data, eca_dict=None, history=None, threshold=UMBRAL_COMPLETITUD):
+    """Compara las mediciones con cada contaminante/periodo del ECA.
+
+    Con ``eca_dict`` se aplica un único valor por contaminante/periodo. Con
+    ``history`` (:class:`~calidad_aire.historico.EcaHistory`) cada promedio se
+    compara con el estándar vigente en su fecha, y el resumen se desglosa por
+    norma; si además se pasa ``eca_dict`` solo se evalúan sus claves.
+
+    Si ``data`` trae columna ``unit`` las mediciones y los estándares se
+    normalizan a µg/m³ antes de comparar (las celdas vacías toman la unidad
+    del estándar y las unidades no convertibles dejan la medición en NaN); si
+    no, los valores se asumen en la misma unidad que el estándar. Un promedio excede el ECA cuando es
+    estrictamente mayor que el valor límite.
+
+    Las ventanas con menos de ``threshold`` de horas con dato (ver
+    :mod:`calidad_aire.validez`) no se comparan con el ECA y se devuelven en
+    ``invalid``; ``threshold=None`` desactiva la regla.
+    """
+    if eca_dict is None and history is None:
+        raise ValueError("Se requiere eca_dict o history")
+    normalizar = "unit" in data.columns
+    if normalizar:
+        por_defecto = eca_units(eca_dict) if eca_dict is not None else history.units()
+        data = data.assign(value=to_canonical(data["value"], data["unit"], data["pollutant"],
+                                              default_units=por_defecto, errors="coerce"))
+    grid = hourly_grid(data)
+    promedios = []
+    resumen = []
+    invalidas = []
+    if grid.empty:
+        return _build_result(promedios, resumen, invalidas)
+
+    if eca_dict is not None:
+        claves = [(cont, per) for cont, periods in eca_dict.items() for per in periods]
+    else:
+        claves = history.keys()
+    contaminantes = grid.columns.get_level_values("pollutant")
+    for pollutant, period in claves:
+        mask = contaminantes == pollutant
+        if not mask.any():
+            continue
+        sub = grid.loc[:, mask]
+        sub.columns = sub.columns.get_level_values("station")
+        avg = period_average(sub, period)
+        if history is not None:
+            limits, units, sources = history.limits_at(pollutant, period, avg.index)
+        else:
+            cell = eca_dict[pollutant][period]
+            limits = np.full(len(avg), float(cell["value"]))
+            units = np.full(len(avg), cell.get("unit"), dtype=object)
+            sources = np.full(len(avg), cell.get("source"), dtype=object)
+        if normalizar:
+            con_limite = ~np.isnan(limits)
+            limits = limits.copy()
+            limits[con_limite] = to_canonical(limits[con_limite], units[con_limite], pollutant)
+            units = np.where(con_limite, CANONICAL_UNIT, None)
+
+        values = avg.to_numpy(dtype="float64")
+        invalid = np.zeros(values.shape, dtype=bool)
+        if threshold is not None:
+            fraccion = completeness(sub, period).to_numpy()
+            invalid = (fraccion < threshold) & ~np.isnan(values)
+            rows, cols = np.nonzero(invalid)
+            invalidas.append(pd.DataFrame({
+                "timestamp": avg.index[rows],
+                "station": avg.columns[cols],
+                "pollutant": pollutant,
+                "period": period,
+                "value": values[rows, cols],
+                "completeness": fraccion[rows, cols],
+            }))
+            values = np.where(invalid, np.nan, values)
+        valid = ~np.isnan(values)
+        exceeds = values > limits[:, None]
+
+        rows, cols = np.nonzero(valid)
+        promedios.append(pd.DataFrame({
+            "timestamp": avg.index[rows],
+            "station": avg.columns[cols],
+            "pollutant": pollutant,
+            "period": period,
+            "value": values[rows, cols],
+            "limit": limits[rows],
+            "unit": units[rows],
+            "exceeds": exceeds[rows, cols],
+        }))
+        # Un bloque de resumen por tramo de vigencia de la misma norma
+        cortes = np.flatnonzero(sources[1:] != sources[:-1]) + 1
+        for ini, fin in zip(np.r_[0, cortes], np.r_[cortes, len(avg)]):
+            if sources[ini] is None:
+                continue
+            resumen.append(pd.DataFrame({
+                "station": avg.columns,
+                "pollutant": pollutant,
+                "period": period,
+                "limit": limits[ini],
+                "unit": units[ini],
+                "source": sources[ini],
+                "n_valid": valid[ini:fin].sum(axis=0),
+                "n_invalid": invalid[ini:fin].sum(axis=0),
+                "n_exceed": exceeds[ini:fin].sum(axis=0),
+                "max_value": np.max(values[ini:fin], axis=0, initial=-np.inf, where=valid[ini:fin]),
+            }))
+    return _build_result(promedios, resumen, invalidas)
+
+
+def empty_result():
+    return _build_result([], [], [])
+
+
+def _build_result(promedios, resumen, invalidas):
+    if promedios:
+        averages = pd.concat(promedios, ignore_index=True)
+    else:
+        averages = pd.DataFrame(columns=_COLUMNAS_PROMEDIOS)
+    if resumen:
+        summary = pd.concat(resumen, ignore_index=True)
+    else:
+        summary = pd.DataFrame(columns=_COLUMNAS_RESUMEN)
+    for col in ("station", "pollutant", "period", "unit"):
+        averages[col] = averages[col].astype("category")
+    averages["exceeds"] = averages["exceeds"].astype(bool)
+    if len(summary):
+        summary["max_value"] = summary["max_value"].where(summary["n_valid"] > 0)
+    if invalidas:
+        invalid = pd.concat(invalidas, ignore_index=True)
+    else:
+        invalid = pd.DataFrame(columns=_COLUMNAS_INVALIDAS)
+    return ComplianceResult(averages=averages, summary=summary, invalid=invalid)
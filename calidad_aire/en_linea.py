@@ -0,0 +1,321 @@
+"""Evaluación incremental de excedencias para datos horarios en vivo.
+
+Cada estación × contaminante mantiene el estado mínimo de sus ventanas del
+ECA: un anillo de 8 valores con suma y conteo para la media móvil de 8 h, y
+acumuladores de suma/conteo para el día y el año calendario. Cada lectura
+nueva actualiza ese estado en O(1), sin recalcular el historial, y el estado
+completo se guarda en un checkpoint JSON para continuar tras un reinicio.
+
+La semántica coincide con :mod:`calidad_aire.cumplimiento`: las horas
+faltantes cuentan como NaN en la media móvil (que también se evalúa en
+ellas), y las medias diaria y anual se evalúan al cerrar el día o el año, es
+decir, al llegar la primera lectura del periodo siguiente. Las ventanas que
+no alcanzan la completitud mínima (:mod:`calidad_aire.validez`) no se
+comparan con el ECA y se cuentan en ``invalid``.
+"""
+import json
+import math
+import os
+from array import array
+from datetime import date
+from typing import NamedTuple
+
+import pandas as pd
+
+from calidad_aire.unidades import CANONICAL_UNIT, conversion_factor, is_missing_unit
+from calidad_aire.validez import UMBRAL_COMPLETITUD, min_hours
+
+CHECKPOINT_VERSION = 1
+_EPOCH = pd.Timestamp("1970-01-01")
+_ORDINAL_EPOCH = date(1970, 1, 1).toordinal()
+_NS_POR_HORA = 3_600_000_000_000
+
+
+class ExceedanceEvent(NamedTuple):
+    station: str
+    pollutant: str
+    period: str
+    timestamp: pd.Timestamp
+    value: float
+    limit: float
+    unit: str
+    source: str
+
+
+def _dia(hora):
+    return hora // 24
+
+
+def _anio(hora):
+    return date.fromordinal(_ORDINAL_EPOCH + hora // 24).year
+
+
+class RollingMean:
+    """Media de las últimas ``size`` horas con NaN para horas sin dato."""
+
+    __slots__ = ("size", "buffer", "pos", "total", "count")
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = array("d", [math.nan] * size)
+        self.pos = 0
+        self.total = 0.0
+        self.count = 0
+
+    def push(self, value):
+        viejo = self.buffer[self.pos]
+        if not math.isnan(viejo):
+            self.total -= viejo
+            self.count -= 1
+        self.buffer[self.pos] = value
+        if not math.isnan(value):
+            self.total += value
+            self.count += 1
+        self.pos = (self.pos + 1) % self.size
+        if self.pos == 0:
+            # Recalcular en cada vuelta acota el error acumulado de la suma
+            self.total = math.fsum(v for v in self.buffer if not math.isnan(v))
+
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def reset(self):
+        """Vacía el anillo (todas las horas sin dato)."""
+        for i in range(self.size):
+            self.buffer[i] = math.nan
+        self.pos = 0
+        self.total = 0.0
+        self.count = 0
+
+    def to_state(self):
+        return {"buffer": [None if math.isnan(v) else v for v in self.buffer], "pos": self.pos}
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls(len(state["buffer"]))
+        for i, v in enumerate(state["buffer"]):
+            obj.buffer[i] = math.nan if v is None else v
+        obj.pos = state["pos"]
+        validos = [v for v in obj.buffer if not math.isnan(v)]
+        obj.total = math.fsum(validos)
+        obj.count = len(validos)
+        return obj
+
+
+class CalendarMean:
+    """Media del día o año calendario en curso (clave entera del periodo)."""
+
+    __slots__ = ("freq", "key", "total", "count")
+
+    def __init__(self, freq, key=None, total=0.0, count=0):
+        self.freq = freq
+        self.key = key
+        self.total = total
+        self.count = count
+
+    def push(self, hora, value):
+        """Acumula ``value``; si ``hora`` abre un periodo nuevo devuelve ``close()`` del cerrado."""
+        key = _dia(hora) if self.freq == "D" else _anio(hora)
+        cerrado = None
+        if self.key is not None and key != self.key:
+            cerrado = self.close()
+        self.key = key
+        if not math.isnan(value):
+            self.total += value
+            self.count += 1
+        return cerrado
+
+    def close(self):
+        """(inicio, media, horas con dato) del periodo en curso, o None si no tuvo datos."""
+        cerrado = None
+        if self.count:
+            if self.freq == "D":
+                inicio = _EPOCH + pd.Timedelta(days=self.key)
+            else:
+                inicio = pd.Timestamp(year=self.key, month=1, day=1)
+            cerrado = (inicio, self.total / self.count, self.count)
+        self.key, self.total, self.count = None, 0.0, 0
+        return cerrado
+
+    def to_state(self):
+        return {"key": self.key, "total": self.total, "count": self.count}
+
+    @classmethod
+    def from_state(cls, freq, state):
+        return cls(freq, state["key"], state["total"], state["count"])
+
+
+class StreamState:
+    """Ventanas de una estación × contaminante (horas como enteros desde 1970)."""
+
+    __slots__ = ("last_hour", "rolling", "daily", "annual")
+
+    def __init__(self):
+        self.last_hour = None
+        self.rolling = RollingMean(8)
+        self.daily = CalendarMean("D")
+        self.annual = CalendarMean("Y")
+
+
+class OnlineEvaluator:
+    """Evalúa lecturas horarias a medida que llegan contra ``eca_dict``.
+
+    Los valores y los límites se comparan en µg/m³; si una lectura no trae
+    unidad se asume la del ECA para ese contaminante. Las lecturas repetidas,
+    anteriores a la última hora procesada o con una unidad que no se puede
+    convertir se descartan (``skipped``).
+    ``threshold=None`` desactiva la regla de completitud.
+    """
+
+    def __init__(self, eca_dict, threshold=UMBRAL_COMPLETITUD):
+        self.eca = eca_dict
+        self.threshold = threshold
+        self.min_hours = {
+            period: 0 if threshold is None else min_hours(period, threshold)
+            for period in ("8h", "24h")
+        }
+        self.limits = {}
+        self.default_units = {}
+        for pollutant, periods in eca_dict.items():
+            for period, cell in periods.items():
+                limite = cell["value"] * conversion_factor(cell["unit"], CANONICAL_UNIT, pollutant)
+                self.limits[(pollutant, period)] = (limite, cell.get("source"))
+                self.default_units[pollutant] = cell["unit"]
+        self.states = {}
+        self.skipped = 0
+        self.invalid = 0
+
+    def update(self, station, pollutant, timestamp, value, unit=None):
+        """Procesa una lectura y devuelve la lista de excedencias que genera."""
+        hora = pd.Timestamp(timestamp).value // _NS_POR_HORA
+        return self._update_hour(station, pollutant, hora, value, unit)
+
+    def update_frame(self, data):
+        """Procesa un bloque de lecturas (timestamp, station, pollutant, value[, unit])."""
+        horas = pd.to_datetime(data["timestamp"]).to_numpy("datetime64[h]").astype("int64")
+        unidades = data["unit"] if "unit" in data else [None] * len(data)
+        eventos = []
+        for hora, station, pollutant, value, unit in zip(
+            horas.tolist(), data["station"], data["pollutant"], data["value"], unidades
+        ):
+            eventos.extend(self._update_hour(station, pollutant, hora, value, unit))
+        return eventos
+
+    def _update_hour(self, station, pollutant, hora, value, unit):
+        periods = self.eca.get(pollutant)
+        if not periods:
+            return []
+        valor = float(value)
+        if not math.isnan(valor):
+            if is_missing_unit(unit):
+                unit = self.default_units[pollutant]
+            try:
+                valor *= conversion_factor(unit, CANONICAL_UNIT, pollutant)
+            except ValueError:
+                self.skipped += 1
+                return []
+
+        state = self.states.get((station, pollutant))
+        if state is None:
+            state = self.states[(station, pollutant)] = StreamState()
+        elif hora <= state.last_hour:
+            self.skipped += 1
+            return []
+
+        eventos = []
+        if state.last_hour is not None:
+            # Horas sin dato entre lecturas: la media móvil también se evalúa en
+            # ellas, como en el cálculo por lotes, mientras los valores viejos
+            # salen del anillo; pasada una vuelta completa ya no queda ninguno.
+            size = state.rolling.size
+            for hueco in range(state.last_hour + 1, min(hora, state.last_hour + size + 1)):
+                state.rolling.push(math.nan)
+                if "8h" in periods:
+                    self._check_rolling(eventos, station, pollutant, hueco, state.rolling)
+            if hora - state.last_hour > size:
+                state.rolling.reset()
+        state.last_hour = hora
+        state.rolling.push(valor)
+
+        if "1h" in periods and not math.isnan(valor):
+            self._check(eventos, station, pollutant, "1h", hora, valor)
+        if "8h" in periods:
+            self._check_rolling(eventos, station, pollutant, hora, state.rolling)
+        for period, acumulador in (("24h", state.daily), ("anual", state.annual)):
+            cerrado = acumulador.push(hora, valor)
+            if period in periods and cerrado is not None:
+                inicio, media, horas = cerrado
+                if horas < self._required(period, inicio):
+                    self.invalid += 1
+                else:
+                    self._check(eventos, station, pollutant, period, inicio, media)
+        return eventos
+
+    def _required(self, period, inicio):
+        if period != "anual":
+            return self.min_hours[period]
+        if self.threshold is None:
+            return 0
+        return min_hours(period, self.threshold, 8784 if inicio.is_leap_year else 8760)
+
+    def _check_rolling(self, eventos, station, pollutant, hora, rolling):
+        if not rolling.count:
+            return
+        if rolling.count < self.min_hours["8h"]:
+            self.invalid += 1
+            return
+        self._check(eventos, station, pollutant, "8h", hora, rolling.mean())
+
+    def _check(self, eventos, station, pollutant, period, timestamp, value):
+        limite, source = self.limits[(pollutant, period)]
+        if value > limite:
+            if not isinstance(timestamp, pd.Timestamp):
+                timestamp = _EPOCH + pd.Timedelta(hours=timestamp)
+            eventos.append(ExceedanceEvent(
+                station, pollutant, period, timestamp, value, limite, CANONICAL_UNIT, source,
+            ))
+
+    # --- checkpoint ------------------------------------------------------
+    def save(self, path):
+        estados = [
+            {
+                "station": station,
+                "pollutant": pollutant,
+                "last_hour": state.last_hour,
+                "rolling": state.rolling.to_state(),
+                "daily": state.daily.to_state(),
+                "annual": state.annual.to_state(),
+            }
+            for (station, pollutant), state in self.states.items()
+        ]
+        temporal = f"{path}.tmp"
+        with open(temporal, "w", encoding="utf-8") as fh:
+            json.dump({
+                "version": CHECKPOINT_VERSION,
+                "skipped": self.skipped,
+                "invalid": self.invalid,
+                "states": estados,
+            }, fh)
+        os.replace(temporal, path)
+
+    @classmethod
+    def load(cls, path, eca_dict, threshold=UMBRAL_COMPLETITUD):
+        """Restaura el estado guardado; sin checkpoint devuelve un evaluador vacío."""
+        evaluador = cls(eca_dict, threshold)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return evaluador
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada: {data.get('version')!r}")
+        evaluador.skipped = data["skipped"]
+        evaluador.invalid = data.get("invalid", 0)
+        for item in data["states"]:
+            state = StreamState()
+            state.last_hour = item["last_hour"]
+            state.rolling = RollingMean.from_state(item["rolling"])
+            state.daily = CalendarMean.from_state("D", item["daily"])
+            state.annual = CalendarMean.from_state("Y", item["annual"])
+            evaluador.states[(item["station"], item["pollutant"])] = state
+        return evaluador
@@ -0,0 +1,141 @@
+"""Exportación por bloques a CSV, Parquet y XLSX.
+
+Las tablas se escriben en bloques de ``CHUNKSIZE`` filas a un archivo
+temporal (o al destino indicado), sin armar el contenido completo como una
+sola cadena en memoria. Las columnas se exportan con sus valores numéricos y
+una columna ``unit``, no con los textos de presentación de la app.
+"""
+import importlib.util
+import os
+import tempfile
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except Exception:
+    PYARROW_AVAILABLE = False
+
+# openpyxl solo se importa al exportar a XLSX
+OPENPYXL_AVAILABLE = importlib.util.find_spec("openpyxl") is not None
+
+CHUNKSIZE = 100_000
+XLSX_MAX_FILAS = 1_048_575  # filas de datos por hoja (más el encabezado)
+
+# formato → (tipo MIME, extensión)
+FORMATOS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+}
+
+
+def available_formats():
+    """Formatos que se pueden escribir con las dependencias instaladas."""
+    disponibles = {"csv": True, "parquet": PYARROW_AVAILABLE, "xlsx": OPENPYXL_AVAILABLE}
+    return [fmt for fmt in FORMATOS if disponibles[fmt]]
+
+
+def eca_table(eca_dict):
+    """ECA en formato largo: pollutant, period, value (numérico), unit, source."""
+    return pd.DataFrame(
+        [
+            {
+                "pollutant": pollutant,
+                "period": period,
+                "value": float(cell["value"]),
+                "unit": cell.get("unit"),
+                "source": cell.get("source"),
+            }
+            for pollutant, periods in eca_dict.items()
+            for period, cell in periods.items()
+        ],
+        columns=["pollutant", "period", "value", "unit", "source"],
+    )
+
+
+def iter_chunks(df, chunksize=CHUNKSIZE):
+    for inicio in range(0, len(df), chunksize):
+        yield df.iloc[inicio:inicio + chunksize]
+
+
+def write_csv(df, sink, chunksize=CHUNKSIZE):
+    """CSV UTF-8 sin índice; ``sink`` es una ruta o un archivo binario."""
+    propio = not hasattr(sink, "write")
+    fh = open(sink, "wb") if propio else sink
+    try:
+        fh.write(df.iloc[:0].to_csv(index=False).encode("utf-8"))
+        for chunk in iter_chunks(df, chunksize):
+            fh.write(chunk.to_csv(index=False, header=False).encode("utf-8"))
+    finally:
+        if propio:
+            fh.close()
+
+
+def write_parquet(df, sink, chunksize=CHUNKSIZE, compression="zstd"):
+    """Parquet comprimido, un row group por bloque."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow no está instalado; exporte en CSV")
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for chunk in iter_chunks(df, chunksize):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(df, sink, chunksize=CHUNKSIZE):
+    """XLSX en modo de solo escritura; pasa a otra hoja al llegar al límite de filas."""
+    if not OPENPYXL_AVAILABLE:
+        raise RuntimeError("openpyxl no está instalado; exporte en CSV")
+    from openpyxl import Workbook
+
+    libro = Workbook(write_only=True)
+    encabezado = [str(c) for c in df.columns]
+    hoja, filas = None, XLSX_MAX_FILAS
+    for chunk in iter_chunks(df, chunksize):
+        # Categorías a texto y NaN/NaT a celda vacía
+        chunk = chunk.astype({c: object for c in chunk.columns if isinstance(chunk[c].dtype, pd.CategoricalDtype)})
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for fila in chunk.itertuples(index=False, name=None):
+            if filas == XLSX_MAX_FILAS:
+                hoja = libro.create_sheet(f"datos_{len(libro.worksheets) + 1}")
+                hoja.append(encabezado)
+                filas = 0
+            hoja.append(fila)
+            filas += 1
+    if hoja is None:
+        libro.create_sheet("datos_1").append(encabezado)
+    libro.save(sink)
+
+
+_ESCRITORES = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+
+def export_frame(df, fmt, sink=None, chunksize=CHUNKSIZE):
+    """Escribe ``df`` en ``fmt``; sin ``sink`` devuelve un archivo temporal abierto para lectura.
+
+    El temporal se escribe completo y se vuelve a abrir por ruta en modo
+    ``"rb"`` (``io.BufferedReader``, que es lo que acepta el botón de descarga
+    de Streamlit); la ruta se borra enseguida y el contenido se libera al
+    cerrarse el archivo.
+    """
+    try:
+        escritor = _ESCRITORES[fmt]
+    except KeyError:
+        raise ValueError(f"Formato de exportación no soportado: {fmt!r}") from None
+    if sink is not None:
+        escritor(df, sink, chunksize=chunksize)
+        return sink
+    fd, ruta = tempfile.mkstemp(suffix=FORMATOS[fmt][1])
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            escritor(df, fh, chunksize=chunksize)
+        lectura = open(ruta, "rb")
+    finally:
+        try:
+            os.unlink(ruta)
+        except OSError:
+            # Windows no borra archivos abiertos; queda para la limpieza del sistema
+            pass
+    return lectura
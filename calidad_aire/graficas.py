@@ -0,0 +1,175 @@
+"""Series de concentración vs. ECA con reducción de puntos según el zoom.
+
+Una serie horaria de varios años tiene decenas de miles de puntos por
+estación, demasiados para el navegador. Para cada rango visible la serie se
+reduce a unos pocos miles de puntos (min-max por tramo o LTTB) y se conservan
+siempre los puntos que superan la línea del ECA, de modo que ningún pico de
+excedencia desaparece al alejar el zoom. Las trazas usan ``Scattergl``
+(WebGL). plotly se importa solo al construir una figura.
+"""
+import numpy as np
+import pandas as pd
+
+from calidad_aire.unidades import CANONICAL_UNIT, conversion_factor
+
+MAX_PUNTOS = 2000
+
+
+def minmax_indices(y, n_out):
+    """Índices del mínimo y el máximo de ``n_out // 2`` tramos de igual tamaño."""
+    n = len(y)
+    tramos = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    ancho = -(-n // tramos)
+    relleno = tramos * ancho - n
+    bajos = np.concatenate([y, np.full(relleno, np.inf)]).reshape(tramos, ancho)
+    altos = np.concatenate([y, np.full(relleno, -np.inf)]).reshape(tramos, ancho)
+    base = np.arange(tramos) * ancho
+    indices = np.concatenate([base + bajos.argmin(axis=1), base + altos.argmax(axis=1)])
+    return np.unique(indices[indices < n])
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: índices de ``n_out`` puntos representativos."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    bordes = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    elegidos = np.empty(n_out, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        sig_fin = bordes[i + 2] if i + 2 < len(bordes) else n
+        # Vértice C: promedio del tramo siguiente
+        cx = x[fin:sig_fin].mean()
+        cy = y[fin:sig_fin].mean()
+        areas = np.abs((x[a] - cx) * (y[ini:fin] - y[a]) - (x[a] - x[ini:fin]) * (cy - y[a]))
+        a = ini + int(areas.argmax())
+        elegidos[i + 1] = a
+    return elegidos
+
+
+def downsample(series, n_out=MAX_PUNTOS, keep_above=None, method="minmax"):
+    """Reduce ``series`` (índice temporal) a unos ``n_out`` puntos.
+
+    Las horas sin dato se omiten. Con ``keep_above`` se añaden los puntos
+    que lo superan aunque el método los hubiera descartado; si son más de
+    ``n_out`` se reducen a su vez por min-max, conservando los máximos.
+    """
+    series = series.dropna()
+    y = series.to_numpy(dtype="float64")
+    if method == "lttb":
+        indices = lttb_indices(series.index.asi8, y, n_out)
+    elif method == "minmax":
+        indices = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Método de reducción no soportado: {method!r}")
+    if keep_above is not None:
+        sobre = np.flatnonzero(y > keep_above)
+        if len(sobre) > n_out:
+            sobre = sobre[minmax_indices(y[sobre], n_out)]
+        indices = np.union1d(indices, sobre)
+    return series.iloc[indices]
+
+
+def eca_thresholds(eca_dict, pollutant, unit=None):
+    """Líneas del ECA de ``pollutant``: [(periodo, valor, unidad, norma)].
+
+    Con ``unit`` los valores se convierten a esa unidad (la de los datos).
+    """
+    lineas = []
+    for period, cell in eca_dict.get(pollutant, {}).items():
+        valor = float(cell["value"])
+        unidad = cell.get("unit")
+        if unit is not None and unidad != unit:
+            valor *= conversion_factor(unidad, unit, pollutant)
+            unidad = unit
+        lineas.append((period, valor, unidad, cell.get("source")))
+    return lineas
+
+
+def marker_threshold(lineas):
+    """(valor, nombre) para marcar los puntos horarios altos.
+
+    Un valor horario solo se compara con el ECA de 1 hora; si el contaminante
+    no lo tiene, los puntos se marcan sobre el valor de referencia más
+    exigente (que es de otro periodo y no implica una excedencia).
+    """
+    horario = [valor for period, valor, _, _ in lineas if period == "1h"]
+    if horario:
+        return horario[0], "Sobre el ECA 1h"
+    if lineas:
+        return min(valor for _, valor, _, _ in lineas), "Sobre el valor de referencia más exigente"
+    return None, None
+
+
+def concentration_figure(grid, station, pollutant, eca_dict, start=None, end=None,
+                         unit=CANONICAL_UNIT, n_out=MAX_PUNTOS, method="minmax"):
+    """Figura de la serie horaria de una estación con las líneas del ECA.
+
+    ``grid`` es la rejilla de :func:`~calidad_aire.cumplimiento.hourly_grid`;
+    ``start``/``end`` delimitan el rango visible, que se reduce a ``n_out``
+    puntos. Los puntos sobre el umbral de :func:`marker_threshold` se marcan
+    aparte. Con ``unit=None`` los datos se asumen en la unidad del ECA.
+    """
+    import plotly.graph_objects as go
+
+    serie = grid[(station, pollutant)].loc[start:end]
+    lineas = eca_thresholds(eca_dict, pollutant, unit)
+    umbral, nombre = marker_threshold(lineas)
+    reducida = downsample(serie, n_out, keep_above=umbral, method=method)
+    if unit is None:
+        unit = lineas[0][2] if lineas else ""
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=reducida.index, y=reducida.to_numpy(), mode="lines", name=f"{station} (horario)",
+        line=dict(width=1),
+    ))
+    if umbral is not None:
+        picos = reducida[reducida > umbral]
+        fig.add_trace(go.Scattergl(
+            x=picos.index, y=picos.to_numpy(), mode="markers", name=nombre,
+            marker=dict(color="#d62728", size=5),
+        ))
+    for period, valor, unidad, norma in lineas:
+        fig.add_hline(
+            y=valor, line_dash="dash", line_color="#d62728",
+            annotation_text=f"ECA {period}: {valor:g} {unidad}", annotation_position="top left",
+            annotation_hovertext=norma,
+        )
+    fig.update_layout(
+        template="plotly_white",
+        xaxis_title="Fecha",
+        yaxis_title=f"{pollutant} ({unit})",
+        margin=dict(l=20, r=20, t=30, b=20),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02),
+    )
+    fig.update_xaxes(range=[serie.index.min(), serie.index.max()] if len(serie) else None)
+    return fig
+
+
+def timeline_figure(timeline):
+    """Línea de tiempo de las normas (``TIMELINE``)."""
+    import plotly.express as px
+
+    df_time = pd.DataFrame(timeline)
+    df_time["y"] = range(len(df_time))
+    fig = px.scatter(df_time, x="year", y="y", text="norm", hover_data=["what"], height=400)
+    fig.update_yaxes(visible=False, showticklabels=False)
+    fig.update_layout(
+        xaxis_title="Año",
+        showlegend=False,
+        template="plotly_white",
+        margin=dict(l=20, r=20, t=30, b=20)
+    )
+    return fig
+
+
+def series_range(grid):
+    """(primera, última) fecha de la rejilla como ``Timestamp`` a día completo."""
+    return grid.index.min().normalize(), grid.index.max().normalize() + pd.Timedelta(days=1)
@@ -0,0 +1,18 @@
+"""Huellas de contenido para claves de caché."""
+import hashlib
+import json
+
+import pandas as pd
+
+
+def content_hash(*objs):
+    """SHA-256 estable del contenido JSON de ``objs`` (orden de claves normalizado)."""
+    payload = json.dumps(objs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def frame_hash(df):
+    """SHA-256 del contenido de un DataFrame (valores y nombres de columna, sin el índice)."""
+    h = hashlib.sha256(json.dumps(list(map(str, df.columns))).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
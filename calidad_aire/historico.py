@@ -0,0 +1,245 @@
+"""Historial de los ECA para aire con intervalos de vigencia.
+
+Cada versión normativa fija (o reemplaza) valores por contaminante y periodo
+a partir de una fecha. El historial se compila en intervalos
+``[valid_from, valid_to)`` ordenados por clave (contaminante, periodo), y la
+consulta "qué ECA regía en la fecha X" se resuelve con ``np.searchsorted``
+para millones de fechas a la vez.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# Versiones en orden cronológico. "values" usa las claves y unidades de ECA
+# (CO en mg/m³: el DS 074-2001-PCM y el DS 003-2017-MINAM lo expresan en
+# µg/m³). "deroga" cierra todos los valores anteriores en "valid_from".
+# Los periodos "mensual" (Pb) no se modelan porque el motor no los calcula.
+ECA_VERSIONES = [
+    {
+        "norm": "DS N° 074-2001-PCM",
+        "valid_from": "2001-06-24",
+        "deroga": False,
+        "values": {
+            "SO2": {"anual": (80, "µg/m³"), "24h": (365, "µg/m³")},
+            "PM10": {"anual": (50, "µg/m³"), "24h": (150, "µg/m³")},
+            "CO": {"8h": (10, "mg/m³"), "1h": (30, "mg/m³")},
+            "NO2": {"anual": (100, "µg/m³"), "1h": (200, "µg/m³")},
+            "O3": {"8h": (120, "µg/m³")},
+        },
+    },
+    {
+        "norm": "DS N° 069-2003-PCM",
+        "valid_from": "2003-07-15",
+        "deroga": False,
+        "values": {"Pb": {"anual": (0.5, "µg/m³")}},
+    },
+    # DS N° 003-2008-MINAM: valores escalonados por fecha de aplicación
+    {
+        "norm": "DS N° 003-2008-MINAM",
+        "valid_from": "2009-01-01",
+        "deroga": False,
+        "values": {"SO2": {"24h": (80, "µg/m³")}},
+    },
+    {
+        "norm": "DS N° 003-2008-MINAM",
+        "valid_from": "2010-01-01",
+        "deroga": False,
+        "values": {
+            "PM2.5": {"24h": (50, "µg/m³")},
+            "C6H6 (Benceno)": {"anual": (4, "µg/m³")},
+        },
+    },
+    {
+        "norm": "DS N° 003-2008-MINAM",
+        "valid_from": "2014-01-01",
+        "deroga": False,
+        "values": {
+            "SO2": {"24h": (20, "µg/m³")},
+            "PM2.5": {"24h": (25, "µg/m³")},
+            "C6H6 (Benceno)": {"anual": (2, "µg/m³")},
+        },
+    },
+    {
+        "norm": "DS N° 003-2017-MINAM",
+        "valid_from": "2017-06-08",
+        "deroga": True,
+        "values": {
+            "C6H6 (Benceno)": {"anual": (2, "µg/m³")},
+            "SO2": {"24h": (250, "µg/m³")},
+            "NO2": {"1h": (200, "µg/m³"), "anual": (100, "µg/m³")},
+            "PM2.5": {"24h": (50, "µg/m³"), "anual": (25, "µg/m³")},
+            "PM10": {"24h": (100, "µg/m³"), "anual": (50, "µg/m³")},
+            "CO": {"1h": (30, "mg/m³"), "8h": (10, "mg/m³")},
+            "O3": {"8h": (100, "µg/m³")},
+            "Pb": {"anual": (0.5, "µg/m³")},
+        },
+    },
+]
+
+
+def eca_version(eca_dict, norm, valid_from):
+    """Convierte un dict con el formato de ``ECA`` en una versión del historial."""
+    return {
+        "norm": norm,
+        "valid_from": valid_from,
+        "deroga": True,
+        "values": {
+            cont: {per: (cell["value"], cell["unit"]) for per, cell in periods.items()}
+            for cont, periods in eca_dict.items()
+        },
+    }
+
+
+_CODIGO_NORMA = re.compile(r"\d{3,4}-\d{4}-[A-Z]+")
+_ECA_AIRE = re.compile(r"(?i)est[áa]ndares de calidad ambiental (para|de) aire")
+
+
+def current_norm(timeline):
+    """(norma, vigente desde) del ECA más reciente de ``timeline``.
+
+    Es la última entrada que aprueba Estándares de Calidad Ambiental para
+    Aire. La línea de tiempo solo registra el año, así que la vigencia se
+    asume desde el 1 de enero de ese año.
+    """
+    entradas = [e for e in timeline if _ECA_AIRE.search(e.get("what", ""))]
+    if not entradas:
+        raise ValueError("La línea de tiempo no tiene ninguna aprobación de ECA para aire")
+    ultima = max(entradas, key=lambda e: e["year"])
+    return ultima["norm"], f"{ultima['year']}-01-01"
+
+
+def source_conflicts(eca_dict):
+    """Celdas de ``eca_dict`` cuyo valor no coincide con la norma que citan.
+
+    Solo se comparan las normas modeladas en ``ECA_VERSIONES``. Devuelve un
+    DataFrame (pollutant, period, value, unit, source, cited_value).
+    """
+    versiones = {}
+    for version in ECA_VERSIONES:
+        for codigo in _CODIGO_NORMA.findall(version["norm"]):
+            for cont, periods in version["values"].items():
+                for per, valor in periods.items():
+                    versiones.setdefault(codigo, {})[(cont, per)] = valor
+    filas = []
+    for cont, periods in eca_dict.items():
+        for per, cell in periods.items():
+            for codigo in _CODIGO_NORMA.findall(str(cell.get("source", ""))):
+                citado = versiones.get(codigo, {}).get((cont, per))
+                if citado is not None and (float(cell["value"]), cell["unit"]) != (float(citado[0]), citado[1]):
+                    filas.append({
+                        "pollutant": cont, "period": per, "value": cell["value"], "unit": cell["unit"],
+                        "source": cell.get("source"), "cited_value": citado[0],
+                    })
+    return pd.DataFrame(filas, columns=["pollutant", "period", "value", "unit", "source", "cited_value"])
+
+
+def current_history(eca_dict, timeline):
+    """Historial completo: versiones derogadas + ``eca_dict`` como ECA vigente.
+
+    ``eca_dict`` se asigna a la norma y fecha de :func:`current_norm`; las
+    citas de cada celda no se usan porque pueden contradecir la norma que
+    nombran (ver :func:`source_conflicts`).
+    """
+    norma, desde = current_norm(timeline)
+    return EcaHistory(ECA_VERSIONES + [eca_version(eca_dict, norma, desde)])
+
+
+class EcaHistory:
+    """Intervalos de vigencia por (contaminante, periodo) con búsqueda binaria."""
+
+    def __init__(self, versions):
+        self.intervals = _compile_intervals(versions)
+        self._index = {}
+        for key, grupo in self.intervals.groupby(["pollutant", "period"], sort=False):
+            self._index[key] = (
+                grupo["valid_from"].to_numpy("datetime64[ns]"),
+                grupo["valid_to"].to_numpy("datetime64[ns]"),
+                grupo["value"].to_numpy("float64"),
+                grupo["unit"].to_numpy(object),
+                grupo["norm"].to_numpy(object),
+            )
+
+    def keys(self):
+        return list(self._index)
+
+    def units(self):
+        """{contaminante: unidad} del estándar más reciente de cada contaminante."""
+        recientes = self.intervals.sort_values("valid_from", kind="stable")
+        return dict(zip(recientes["pollutant"], recientes["unit"]))
+
+    def limits_at(self, pollutant, period, timestamps):
+        """Valor, unidad y norma vigentes en cada fecha de ``timestamps``.
+
+        Devuelve tres arrays alineados con ``timestamps``; donde no regía
+        ningún estándar el valor es NaN y la norma ``None``.
+        """
+        ts = np.asarray(pd.DatetimeIndex(timestamps).as_unit("ns"), dtype="datetime64[ns]")
+        valores = np.full(len(ts), np.nan)
+        unidades = np.full(len(ts), None, dtype=object)
+        normas = np.full(len(ts), None, dtype=object)
+        entrada = self._index.get((pollutant, period))
+        if entrada is None:
+            return valores, unidades, normas
+        starts, ends, values, units, norms = entrada
+        pos = np.searchsorted(starts, ts, side="right") - 1
+        ok = pos >= 0
+        ok[ok] = ts[ok] < ends[pos[ok]]
+        valores[ok] = values[pos[ok]]
+        unidades[ok] = units[pos[ok]]
+        normas[ok] = norms[pos[ok]]
+        return valores, unidades, normas
+
+    def lookup(self, data):
+        """Límite vigente para cada fila de ``data`` (timestamp, pollutant, period).
+
+        Se agrupa por clave (unas decenas de grupos) y cada grupo se resuelve
+        con una sola búsqueda binaria vectorizada.
+        """
+        limite = np.full(len(data), np.nan)
+        grupos = data.groupby(["pollutant", "period"], observed=True, sort=False).indices
+        for (pollutant, period), filas in grupos.items():
+            valores, _, _ = self.limits_at(pollutant, period, data["timestamp"].to_numpy()[filas])
+            limite[filas] = valores
+        return pd.Series(limite, index=data.index, name="limit")
+
+    def snapshot(self, date):
+        """Dict con el formato de ``ECA`` de los estándares vigentes en ``date``."""
+        fecha = pd.Timestamp(date)
+        vigentes = self.intervals[
+            (self.intervals["valid_from"] <= fecha) & (fecha < self.intervals["valid_to"])
+        ]
+        eca = {}
+        for row in vigentes.itertuples(index=False):
+            eca.setdefault(row.pollutant, {})[row.period] = {
+                "value": row.value, "unit": row.unit, "source": row.norm,
+            }
+        return eca
+
+
+def _compile_intervals(versions):
+    """Aplana las versiones a intervalos no solapados ordenados por fecha."""
+    abiertos = {}
+    filas = []
+    fin_abierto = pd.Timestamp.max.floor("D")
+    for version in sorted(versions, key=lambda v: pd.Timestamp(v["valid_from"])):
+        desde = pd.Timestamp(version["valid_from"])
+        if version["deroga"]:
+            for fila in abiertos.values():
+                fila["valid_to"] = desde
+            abiertos = {}
+        for cont, periods in version["values"].items():
+            for per, (valor, unidad) in periods.items():
+                previo = abiertos.get((cont, per))
+                if previo is not None:
+                    previo["valid_to"] = desde
+                fila = {
+                    "pollutant": cont, "period": per, "value": float(valor), "unit": unidad,
+                    "norm": version["norm"], "valid_from": desde, "valid_to": fin_abierto,
+                }
+                abiertos[(cont, per)] = fila
+                filas.append(fila)
+    intervals = pd.DataFrame(filas, columns=[
+        "pollutant", "period", "value", "unit", "norm", "valid_from", "valid_to",
+    ])
+    return intervals.sort_values(["pollutant", "period", "valid_from"], ignore_index=True)
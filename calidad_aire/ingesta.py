@@ -0,0 +1,343 @@
+"""Lectura por bloques de CSV de estaciones con tipos compactos.
+
+El CSV se recorre en bloques de ``chunksize`` filas: cada bloque se normaliza
+(nombres de columnas y de contaminantes), se convierte a ``float32`` y
+categorías, y se vuelca a un Parquet en caché. Los análisis posteriores leen
+ese Parquet con ``memory_map`` en vez de volver a parsear el CSV, de modo que
+la memoria máxima queda acotada por el tamaño del bloque.
+"""
+import hashlib
+import os
+import re
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calidad_aire.datos import ECA
+from calidad_aire.unidades import CANONICAL_UNIT, canonical_factors, eca_units
+
+# pyarrow es opcional: sin él se concatena en memoria con tipos compactos
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except Exception:
+    PYARROW_AVAILABLE = False
+
+CHUNKSIZE = 500_000
+_HASH_BLOCK = 1 << 20
+
+# Alias aceptados para las columnas del CSV → nombre interno
+ALIAS_COLUMNAS = {
+    "timestamp": "timestamp", "fecha": "timestamp", "fechahora": "timestamp",
+    "datetime": "timestamp", "date": "timestamp",
+    "hora": "time", "time": "time",
+    "station": "station", "estacion": "station", "sitio": "station",
+    "pollutant": "pollutant", "contaminante": "pollutant", "parametro": "pollutant",
+    "value": "value", "valor": "value", "concentracion": "value",
+    "unit": "unit", "unidad": "unit",
+}
+
+# Alias de contaminantes → claves de ECA (se comparan tras _clave_texto)
+ALIAS_CONTAMINANTES = {
+    "pm25": "PM2.5", "mp25": "PM2.5", "particulas25": "PM2.5",
+    "pm10": "PM10", "mp10": "PM10",
+    "so2": "SO2", "dioxidodeazufre": "SO2",
+    "no2": "NO2", "dioxidodenitrogeno": "NO2",
+    "co": "CO", "monoxidodecarbono": "CO",
+    "o3": "O3", "ozono": "O3",
+    "pb": "Pb", "plomo": "Pb", "pbplomo": "Pb", "pbplomoenpm10": "Pb",
+    "c6h6": "C6H6 (Benceno)", "benceno": "C6H6 (Benceno)", "benzene": "C6H6 (Benceno)",
+    "c6h6benceno": "C6H6 (Benceno)",
+    "as": "As (Arsénico)", "arsenico": "As (Arsénico)", "asarsenico": "As (Arsénico)",
+    "asarsenicoenpm10": "As (Arsénico)",
+    "ni": "Ni (Níquel)", "niquel": "Ni (Níquel)", "niniquel": "Ni (Níquel)",
+    "cd": "Cd (Cadmio)", "cadmio": "Cd (Cadmio)", "cdcadmio": "Cd (Cadmio)",
+    "cdcadmioenpm10": "Cd (Cadmio)",
+}
+
+# Las fechas con desfase horario se pasan a la hora local de las estaciones
+ZONA_HORARIA = "America/Lima"
+_DESFASE_HORARIO = r"\d(?:Z|[+-]\d{2}:?\d{2})$"
+
+# Unidad asumida cuando la celda de unidad viene vacía
+UNIDADES_POR_DEFECTO = eca_units(ECA)
+
+_SUBINDICES = str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")
+
+
+def _clave_texto(texto):
+    """Minúsculas, sin tildes, subíndices ni signos: 'SO₂ ' → 'so2'."""
+    texto = unicodedata.normalize("NFKD", str(texto).translate(_SUBINDICES))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]", "", texto.lower())
+
+
+def normalize_pollutant(name):
+    """Nombre de contaminante → clave de ECA; los desconocidos se devuelven limpios."""
+    return ALIAS_CONTAMINANTES.get(_clave_texto(name), str(name).strip())
+
+
+def normalize_columns(columns):
+    """Mapa {columna original: nombre interno} para las columnas reconocidas.
+
+    Una columna ``hora`` aparte se guarda como ``time`` y se suma a la fecha
+    al compactar. Lanza ``ValueError`` si dos columnas corresponden al mismo
+    nombre interno (p. ej. ``fecha`` y ``datetime``), en vez de descartar una.
+    """
+    mapa = {}
+    for col in columns:
+        interno = ALIAS_COLUMNAS.get(_clave_texto(col))
+        if interno is None:
+            continue
+        repetida = next((c for c, i in mapa.items() if i == interno), None)
+        if repetida is not None:
+            raise ValueError(
+                f"Las columnas {repetida!r} y {col!r} del CSV de monitoreo corresponden ambas a {interno!r}"
+            )
+        mapa[col] = interno
+    faltan = {"timestamp", "station", "pollutant", "value"} - set(mapa.values())
+    if faltan:
+        raise ValueError(f"Faltan columnas en el CSV de monitoreo: {sorted(faltan)}")
+    return mapa
+
+
+def compact_chunk(chunk):
+    """Convierte un bloque ya renombrado a tipos compactos.
+
+    ``timestamp`` queda en hora local sin zona: las fechas con desfase
+    (``-05:00``, ``Z``) se convierten a ``ZONA_HORARIA`` y una columna
+    ``time`` se suma a la fecha (ver :func:`combine_date_time`). ``value`` pasa a ``float32`` y ``station``/``pollutant``/``unit`` a
+    categorías; los nombres de contaminante se normalizan sobre las categorías
+    (una vez por valor distinto, no por fila). Si el bloque trae ``unit`` los
+    valores se guardan ya convertidos a µg/m³; las celdas de unidad vacías
+    toman la unidad del ECA del contaminante. Las filas cuya unidad no se
+    puede convertir quedan con valor NaN y conservan su unidad original (ver
+    :func:`unit_errors`).
+    """
+    out = pd.DataFrame({
+        "timestamp": parse_timestamps(chunk["timestamp"], chunk["time"] if "time" in chunk else None),
+        "station": chunk["station"].astype("category"),
+        "pollutant": chunk["pollutant"].astype("category"),
+        "value": pd.to_numeric(chunk["value"], errors="coerce").astype("float32"),
+    })
+    categorias = out["pollutant"].cat.categories
+    nuevas = [normalize_pollutant(c) for c in categorias]
+    if len(set(nuevas)) == len(nuevas):
+        out["pollutant"] = out["pollutant"].cat.rename_categories(nuevas)
+    else:
+        # varios alias del mismo contaminante en el bloque: recodificar
+        out["pollutant"] = out["pollutant"].map(dict(zip(categorias, nuevas))).astype("category")
+    if "unit" in chunk:
+        unidades = chunk["unit"].astype("category")
+        factores = canonical_factors(unidades, out["pollutant"], len(out), UNIDADES_POR_DEFECTO, errors="coerce")
+        out["value"] = (out["value"].to_numpy("float64") * factores).astype("float32")
+        fallidas = np.isnan(factores)
+        if fallidas.any():
+            out["unit"] = pd.Categorical(np.where(fallidas, unidades.to_numpy(object), CANONICAL_UNIT))
+        else:
+            out["unit"] = pd.Categorical.from_codes(np.zeros(len(out), dtype="int8"), [CANONICAL_UNIT])
+    return out
+
+
+def parse_timestamps(fechas, horas=None):
+    """Fechas en hora local sin zona; ``horas`` (opcional) se suma a cada fecha.
+
+    Las fechas con desfase horario se convierten a ``ZONA_HORARIA`` para que
+    los días y años de los promedios sean los locales y no los de UTC.
+    """
+    marcas = _to_datetime(fechas) if horas is None else combine_date_time(fechas, horas)
+    if marcas.dt.tz is not None:
+        marcas = marcas.dt.tz_convert(ZONA_HORARIA).dt.tz_localize(None)
+    return marcas
+
+
+def _to_datetime(fechas):
+    # Desfases distintos ("-05:00" y "Z") solo se pueden leer como UTC
+    textos = fechas.dropna().astype("string").str.strip()
+    con_desfase = textos.str.contains(_DESFASE_HORARIO).to_numpy(bool)
+    if con_desfase.all() and len(textos):
+        return pd.to_datetime(fechas, utc=True)
+    if con_desfase.any():
+        raise ValueError("El CSV de monitoreo mezcla fechas con y sin desfase horario")
+    return pd.to_datetime(fechas)
+
+
+def combine_date_time(fechas, horas):
+    """Suma a cada fecha su hora: "HH", "HH:MM" o "HH:MM:SS" (se admite "24" y "24:00")."""
+    partes = horas.astype("string").str.strip().str.extract(r"^(\d{1,2})(?::(\d{2}))?(?::(\d{2}))?$")
+    invalidas = partes[0].isna() & horas.notna()
+    if invalidas.any():
+        ejemplo = horas[invalidas].iloc[0]
+        raise ValueError(f"Hora no reconocida en el CSV de monitoreo: {ejemplo!r} (use HH o HH:MM)")
+    partes = partes.apply(pd.to_numeric).fillna({1: 0, 2: 0})
+    desfase = (
+        pd.to_timedelta(partes[0], unit="h")
+        + pd.to_timedelta(partes[1], unit="min")
+        + pd.to_timedelta(partes[2], unit="s")
+    )
+    return _to_datetime(fechas) + desfase
+
+
+def unit_errors(source):
+    """Filas cuya unidad no se pudo convertir a µg/m³ al leerlas.
+
+    ``source`` es un DataFrame de mediciones o la ruta del Parquet en caché;
+    en ese caso solo se leen las filas rechazadas.
+    """
+    if is_parquet_source(source):
+        schema = pq.read_schema(source)
+        if "unit" not in schema.names:
+            return schema.empty_table().to_pandas()
+        filtro = (pc.field("unit") != CANONICAL_UNIT) | pc.field("unit").is_null()
+        return pq.read_table(source, filters=filtro, memory_map=True).to_pandas()
+    if "unit" not in source:
+        return source.iloc[:0]
+    return source[source["unit"].astype("string").ne(CANONICAL_UNIT).fillna(True).to_numpy(bool)]
+
+
+def iter_monitoring_chunks(source, chunksize=CHUNKSIZE):
+    """Itera bloques compactos de un CSV (ruta o buffer binario/texto)."""
+    header = _read_header(source)
+    mapa = normalize_columns(header)
+    dtypes = {col: "string" for col, interno in mapa.items() if interno != "value"}
+    reader = pd.read_csv(source, usecols=list(mapa), dtype=dtypes, chunksize=chunksize)
+    for chunk in reader:
+        # un CSV con solo encabezado produce un bloque vacío
+        if not chunk.empty:
+            yield compact_chunk(chunk.rename(columns=mapa))
+
+
+def _read_header(source):
+    if hasattr(source, "seek"):
+        pos = source.tell()
+        header = pd.read_csv(source, nrows=0).columns
+        source.seek(pos)
+        return header
+    return pd.read_csv(source, nrows=0).columns
+
+
+def file_digest(source):
+    """SHA-256 del contenido leído en bloques de 1 MiB."""
+    digest = hashlib.sha256()
+    if hasattr(source, "read"):
+        pos = source.tell()
+        for block in _blocks(source):
+            digest.update(block)
+        source.seek(pos)
+    else:
+        with open(source, "rb") as fh:
+            for block in _blocks(fh):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _blocks(fh):
+    while True:
+        block = fh.read(_HASH_BLOCK)
+        if not block:
+            return
+        yield block if isinstance(block, bytes) else block.encode("utf-8")
+
+
+def _arrow_schema(columns):
+    campos = {
+        "timestamp": pa.timestamp("us"),
+        "station": pa.dictionary(pa.int32(), pa.string()),
+        "pollutant": pa.dictionary(pa.int32(), pa.string()),
+        "value": pa.float32(),
+        "unit": pa.dictionary(pa.int32(), pa.string()),
+    }
+    return pa.schema([(col, campos[col]) for col in columns])
+
+
+def ingest_to_parquet(source, cache_dir, chunksize=CHUNKSIZE):
+    """Vuelca el CSV a ``<cache_dir>/<sha256>.parquet`` y devuelve la ruta.
+
+    Si el Parquet de ese contenido ya existe no se vuelve a leer el CSV. Cada
+    bloque se escribe como un row group, así que nunca hay más de un bloque
+    en memoria.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow no está instalado; use read_monitoring_csv()")
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    destino = Path(cache_dir) / f"{file_digest(source)}.parquet"
+    if destino.exists():
+        return destino
+
+    temporal = destino.with_suffix(".parquet.tmp")
+    writer = None
+    try:
+        for chunk in iter_monitoring_chunks(source, chunksize=chunksize):
+            if writer is None:
+                schema = _arrow_schema(chunk.columns)
+                writer = pq.ParquetWriter(temporal, schema, compression="zstd")
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError("El CSV de monitoreo no contiene filas")
+    os.replace(temporal, destino)
+    return destino
+
+
+def load_monitoring(path, columns=None, stations=None, pollutants=None):
+    """Lee el Parquet de caché con ``memory_map``, filtrando en la lectura."""
+    filtros = []
+    if stations is not None:
+        filtros.append(("station", "in", list(stations)))
+    if pollutants is not None:
+        filtros.append(("pollutant", "in", list(pollutants)))
+    table = pq.read_table(path, columns=columns, filters=filtros or None, memory_map=True)
+    return table.to_pandas()
+
+
+def read_monitoring_csv(source, chunksize=CHUNKSIZE):
+    """Alternativa sin pyarrow: concatena los bloques compactos en memoria."""
+    chunks = list(iter_monitoring_chunks(source, chunksize=chunksize))
+    if not chunks:
+        raise ValueError("El CSV de monitoreo no contiene filas")
+    data = pd.concat(chunks, ignore_index=True)
+    for col in ("station", "pollutant", "unit"):
+        if col in data:
+            data[col] = data[col].astype("category")
+    return data
+
+
+def monitoring_source(source, cache_dir=None, chunksize=CHUNKSIZE):
+    """Ruta del Parquet en caché si hay pyarrow y ``cache_dir``; si no, el DataFrame del CSV.
+
+    La ruta permite leer después solo algunas estaciones (``load_monitoring``
+    o :func:`~calidad_aire.lotes.evaluate_network`) sin cargar el archivo entero.
+    """
+    if PYARROW_AVAILABLE and cache_dir is not None:
+        return ingest_to_parquet(source, cache_dir, chunksize=chunksize)
+    return read_monitoring_csv(source, chunksize=chunksize)
+
+
+def is_parquet_source(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def source_rows(source):
+    """Número de mediciones de un DataFrame o de un Parquet en caché (sin leerlo)."""
+    if is_parquet_source(source):
+        return pq.read_metadata(source).num_rows
+    return len(source)
+
+
+def source_stations(source):
+    """Estaciones presentes, ordenadas; de un Parquet solo se lee la columna ``station``."""
+    if is_parquet_source(source):
+        source = load_monitoring(source, columns=["station"])
+    return sorted(source["station"].dropna().unique())
+
+
+def read_monitoring(source, cache_dir=None, chunksize=CHUNKSIZE):
+    """Punto de entrada: usa la caché Parquet si hay pyarrow y ``cache_dir``."""
+    fuente = monitoring_source(source, cache_dir, chunksize=chunksize)
+    return load_monitoring(fuente) if is_parquet_source(fuente) else fuente
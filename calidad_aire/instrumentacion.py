@@ -0,0 +1,134 @@
+"""Métricas de la app: tiempos por sección, aciertos de caché y memoria pico.
+
+Los contadores son acumulativos por proceso (todas las sesiones) y su costo
+es un ``perf_counter`` y un incremento por llamada. La memoria pico (sobre lo
+ya asignado al empezar la sección) usa ``tracemalloc``, que sí encarece la
+ejecución, por eso solo se activa a pedido; como ``tracemalloc`` es global
+al proceso, con varias sesiones simultáneas el pico de una sección puede
+incluir memoria de otras.
+"""
+import functools
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+@dataclass
+class SectionStats:
+    renders: int = 0
+    total_s: float = 0.0
+    last_s: float = 0.0
+    max_s: float = 0.0
+    peak_bytes: int = 0
+
+
+@dataclass
+class CacheStats:
+    calls: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self):
+        return (self.calls - self.misses) / self.calls if self.calls else float("nan")
+
+
+class Instrumentation:
+    """Registro de métricas compartido por las sesiones de la app."""
+
+    def __init__(self):
+        self.sections = {}
+        self.caches = {}
+        self._lock = threading.Lock()
+        self._tracing = False
+
+    # --- secciones -------------------------------------------------------
+    def start(self, section, memory=False):
+        """Empieza a medir ``section``; devuelve el testigo para :meth:`stop`."""
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+            tracemalloc.reset_peak()
+        elif self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        base = tracemalloc.get_traced_memory()[0] if memory else 0
+        return section, memory, base, time.perf_counter()
+
+    def stop(self, token):
+        section, memory, base, inicio = token
+        duracion = time.perf_counter() - inicio
+        # Pico por encima de lo que ya estaba asignado al empezar la sección
+        pico = tracemalloc.get_traced_memory()[1] - base if memory and tracemalloc.is_tracing() else 0
+        with self._lock:
+            stats = self.sections.setdefault(section, SectionStats())
+            stats.renders += 1
+            stats.total_s += duracion
+            stats.last_s = duracion
+            stats.max_s = max(stats.max_s, duracion)
+            stats.peak_bytes = max(stats.peak_bytes, pico)
+        return duracion
+
+    # --- cachés ----------------------------------------------------------
+    def cached(self, name, cache_decorator):
+        """Aplica ``cache_decorator`` (p. ej. ``st.cache_data(...)``) contando llamadas y fallos.
+
+        El cuerpo de la función solo se ejecuta en un fallo de caché; las
+        llamadas se cuentan por fuera. La función devuelta conserva ``clear()``.
+        """
+        def decorador(fn):
+            @functools.wraps(fn)
+            def cuerpo(*args, **kwargs):
+                self._count(name, miss=True)
+                return fn(*args, **kwargs)
+
+            en_cache = cache_decorator(cuerpo)
+
+            @functools.wraps(fn)
+            def llamada(*args, **kwargs):
+                self._count(name, call=True)
+                return en_cache(*args, **kwargs)
+
+            llamada.clear = en_cache.clear
+            return llamada
+        return decorador
+
+    def _count(self, name, call=False, miss=False):
+        with self._lock:
+            stats = self.caches.setdefault(name, CacheStats())
+            stats.calls += call
+            stats.misses += miss
+
+    # --- reportes --------------------------------------------------------
+    def section_table(self):
+        return pd.DataFrame(
+            [
+                {
+                    "sección": nombre,
+                    "renders": s.renders,
+                    "último (ms)": s.last_s * 1e3,
+                    "medio (ms)": s.total_s / s.renders * 1e3,
+                    "máximo (ms)": s.max_s * 1e3,
+                    "memoria pico (MB)": s.peak_bytes / 2**20 if s.peak_bytes else None,
+                }
+                for nombre, s in self.sections.items()
+            ],
+            columns=["sección", "renders", "último (ms)", "medio (ms)", "máximo (ms)", "memoria pico (MB)"],
+        )
+
+    def cache_table(self):
+        return pd.DataFrame(
+            [
+                {"caché": nombre, "llamadas": c.calls, "fallos": c.misses, "aciertos (%)": c.hit_rate * 100}
+                for nombre, c in self.caches.items()
+            ],
+            columns=["caché", "llamadas", "fallos", "aciertos (%)"],
+        )
+
+    def reset(self):
+        with self._lock:
+            self.sections.clear()
+            self.caches.clear()
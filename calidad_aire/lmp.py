@@ -0,0 +1,270 @@
+"""Estructuración de la tabla LMP (límites de emisión por sector).
+
+``LMP`` guarda los valores como texto libre ("80 (nueva) / 120 (existente)",
+"100-200 según contaminante", "150-200 / Valores específicos por elemento").
+Aquí se convierten una sola vez en registros numéricos (un registro por
+sector × contaminante × tipo de instalación) con índices por sector,
+contaminante y norma para filtrar y verificar muestras de chimenea sin
+volver a leer los textos.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from calidad_aire.unidades import is_missing_unit, normalize_unit
+
+COLUMNAS = [
+    "sector", "parameter", "pollutant", "group", "facility",
+    "min_value", "max_value", "unit", "norm", "numeric", "note", "raw_value",
+]
+
+# Columnas obligatorias del CSV de muestras de chimenea
+COLUMNAS_MUESTRAS = ["sector", "pollutant", "value"]
+# ``facility_lmp`` de los límites que aplican a cualquier tipo de instalación
+LIMITE_GENERAL = "general"
+
+_SUBINDICES = str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")
+_NUMERO = r"\d+(?:[.,]\d+)?"
+_PARTE_NUMERICA = re.compile(
+    rf"^\s*(?P<min>{_NUMERO})(?:\s*-\s*(?P<max>{_NUMERO}))?\s*(?:\((?P<facility>[^)]*)\))?\s*(?P<rest>.*)$"
+)
+
+
+def split_top_level(texto, sep):
+    """Divide por ``sep`` ignorando los separadores dentro de paréntesis."""
+    partes, actual, nivel = [], [], 0
+    for c in texto:
+        if c == "(":
+            nivel += 1
+        elif c == ")":
+            nivel -= 1
+        if c == sep and nivel == 0:
+            partes.append("".join(actual).strip())
+            actual = []
+        else:
+            actual.append(c)
+    partes.append("".join(actual).strip())
+    return [p for p in partes if p]
+
+
+def parse_parameter(texto):
+    """'PM, SO₂, Metales pesados (As, Pb)' → [('PM', None), ('SO2', None), ('As', 'Metales'), ...]."""
+    contaminantes = []
+    for item in split_top_level(texto.translate(_SUBINDICES), ","):
+        match = re.match(r"^(?P<name>[^(]*)\((?P<inner>[^)]*)\)\s*$", item)
+        if match and "," in match.group("inner"):
+            grupo = "Metales" if "metal" in match.group("name").lower() else match.group("name").strip()
+            contaminantes.extend((e.strip(), grupo) for e in match.group("inner").split(","))
+        elif match:
+            contaminantes.append((match.group("inner").strip(), None))
+        else:
+            contaminantes.append((item.strip(), None))
+    return contaminantes
+
+
+def parse_value(texto):
+    """Divide el valor en partes ``{"min", "max", "facility", "note"}``.
+
+    Las partes sin número conservan solo ``note`` (p. ej. "Según norma Euro
+    IV"); un texto sin ningún número queda en una sola parte aunque tenga
+    "/". Los decimales con coma se aceptan.
+    """
+    partes = []
+    for parte in split_top_level(texto, "/"):
+        match = _PARTE_NUMERICA.match(parte)
+        if match is None:
+            partes.append({"min": np.nan, "max": np.nan, "facility": None, "note": parte})
+            continue
+        minimo = float(match.group("min").replace(",", "."))
+        maximo = float(match.group("max").replace(",", ".")) if match.group("max") else minimo
+        partes.append({
+            "min": minimo,
+            "max": maximo,
+            "facility": (match.group("facility") or "").strip().lower() or None,
+            "note": match.group("rest").strip() or None,
+        })
+    if all(np.isnan(p["min"]) for p in partes):
+        return [{"min": np.nan, "max": np.nan, "facility": None, "note": texto.strip()}]
+    return partes
+
+
+def normalize_lmp_unit(unit):
+    """Unidad normalizada; mg/Nm³ (condiciones normales) se conserva aparte."""
+    alternativas = []
+    for u in re.split(r"\s+o\s+", str(unit).strip()):
+        if re.search(r"nm3|nm³", u, flags=re.IGNORECASE):
+            alternativas.append(re.sub(r"(?i)nm3|nm³", "Nm³", u.replace(" ", "")))
+            continue
+        try:
+            alternativas.append(normalize_unit(u))
+        except ValueError:
+            alternativas.append(u.strip())
+    return " | ".join(alternativas)
+
+
+def parse_lmp(lmp_rows):
+    """Registros estructurados a partir de las filas de ``LMP``."""
+    registros = []
+    for fila in lmp_rows:
+        contaminantes = parse_parameter(fila["Parámetro"])
+        partes = parse_value(fila["Valor"])
+        numericas = [p for p in partes if not np.isnan(p["min"])]
+        textuales = [p for p in partes if np.isnan(p["min"])]
+        unidad = normalize_lmp_unit(fila["Unidad"])
+        for pollutant, grupo in contaminantes:
+            if numericas and textuales and grupo is not None:
+                # "150-200 / Valores específicos por elemento": el texto aplica a los metales
+                aplicables = textuales
+            elif numericas:
+                aplicables = numericas
+            else:
+                aplicables = textuales
+            for parte in aplicables:
+                registros.append({
+                    "sector": fila["Sector"],
+                    "parameter": fila["Parámetro"],
+                    "pollutant": pollutant,
+                    "group": grupo,
+                    "facility": parte["facility"],
+                    "min_value": parte["min"],
+                    "max_value": parte["max"],
+                    "unit": unidad,
+                    "norm": fila["Norma"],
+                    "numeric": not np.isnan(parte["min"]),
+                    "note": parte["note"],
+                    "raw_value": fila["Valor"],
+                })
+    return pd.DataFrame(registros, columns=COLUMNAS)
+
+
+class LmpTable:
+    """Registros LMP con índices hash por sector, contaminante y norma."""
+
+    def __init__(self, lmp_rows):
+        self.records = parse_lmp(lmp_rows)
+        self.by_sector = _build_index(self.records["sector"])
+        self.by_pollutant = _build_index(self.records["pollutant"])
+        self.by_norm = _build_index(self.records["norm"])
+        self._sample_limits = _sample_limits(self.records)
+
+    def query(self, sectors=None, pollutants=None, norms=None):
+        """Registros que cumplen todos los filtros (``None`` = sin filtro).
+
+        Cada filtro es una lista de valores; las posiciones se obtienen del
+        índice (lookup O(1) por valor) y se intersectan.
+        """
+        posiciones = None
+        for indice, valores in (
+            (self.by_sector, sectors), (self.by_pollutant, pollutants), (self.by_norm, norms),
+        ):
+            if valores is None:
+                continue
+            encontradas = [indice[v] for v in valores if v in indice]
+            filas = np.unique(np.concatenate(encontradas)) if encontradas else np.array([], dtype=np.intp)
+            posiciones = filas if posiciones is None else np.intersect1d(posiciones, filas, assume_unique=True)
+        if posiciones is None:
+            return self.records
+        return self.records.iloc[posiciones]
+
+    def check_samples(self, samples):
+        """Compara muestras de chimenea (sector, pollutant, value[, facility][, unit]).
+
+        La unión con los límites es un hash join; ``status`` es "excede" si el
+        valor supera el máximo, "revisar" si cae dentro de un rango que depende
+        del contaminante o proceso, "cumple" si no supera el mínimo,
+        "sin límite numérico" si la norma no fija un valor, "unidad distinta"
+        si la unidad de la muestra no es la del límite (no se comparan los
+        números) y "sin registro LMP" si no hay límite para ese
+        sector/contaminante. Una muestra cuyo tipo de instalación no tiene
+        límite propio se compara con el límite general del sector o, si la
+        norma solo fija límites por tipo de instalación (p. ej.
+        nueva/existente), con el más exigente; ``facility_lmp`` indica la
+        fila aplicada (``LIMITE_GENERAL`` o el tipo de instalación). La
+        columna ``unit`` de las muestras se devuelve como ``sample_unit``; una
+        muestra sin unidad se supone en la unidad del límite.
+
+        Lanza ``ValueError`` si faltan columnas obligatorias o si ``value``
+        no es numérico.
+        """
+        faltantes = [c for c in COLUMNAS_MUESTRAS if c not in samples.columns]
+        if faltantes:
+            raise ValueError(
+                "El archivo de muestras debe tener las columnas sector, pollutant y value; "
+                f"faltan: {', '.join(faltantes)}"
+            )
+        muestras = samples.copy()
+        valor = pd.to_numeric(muestras["value"], errors="coerce")
+        invalidos = valor.isna() & muestras["value"].notna()
+        if invalidos.any():
+            filas = ", ".join(str(i + 2) for i in np.flatnonzero(invalidos.to_numpy())[:5])
+            raise ValueError(f"La columna value debe ser numérica (filas del CSV: {filas})")
+        muestras["value"] = valor.astype("float64")
+        if "facility" not in muestras:
+            muestras["facility"] = None
+        instalacion = muestras["facility"].astype("string").str.strip().str.lower()
+        muestras["facility"] = instalacion.mask(instalacion == "")
+        muestras["pollutant"] = muestras["pollutant"].astype(str).str.translate(_SUBINDICES).str.strip()
+        if "unit" in muestras:
+            muestras = muestras.rename(columns={"unit": "sample_unit"})
+            muestras["sample_unit"] = muestras["sample_unit"].map(
+                lambda u: None if is_missing_unit(u) else normalize_lmp_unit(u)
+            )
+        muestras["_fila"] = np.arange(len(muestras))
+
+        # Primero el límite del tipo de instalación; si no existe, el general del sector
+        exacto = muestras.merge(self._sample_limits, on=["sector", "pollutant", "facility"], how="inner")
+        resto = muestras[~muestras["_fila"].isin(exacto["_fila"])]
+        generales = self._sample_limits[self._sample_limits["facility"].isna()].drop(columns="facility")
+        respaldo = resto.merge(generales, on=["sector", "pollutant"], how="left", indicator=True)
+        cruce = (
+            pd.concat([exacto.assign(_merge="both"), respaldo], ignore_index=True)
+            .sort_values("_fila", kind="stable", ignore_index=True)
+        )
+
+        if "sample_unit" in cruce:
+            otra_unidad = np.array([
+                pd.notna(m) and pd.notna(l) and m not in str(l).split(" | ")
+                for m, l in zip(cruce["sample_unit"], cruce["unit"])
+            ], dtype=bool)
+        else:
+            otra_unidad = np.zeros(len(cruce), dtype=bool)
+        cruce["status"] = np.select(
+            [
+                cruce["_merge"] == "left_only",
+                cruce["max_value"].isna(),
+                otra_unidad,
+                cruce["value"] > cruce["max_value"],
+                cruce["value"] > cruce["min_value"],
+            ],
+            ["sin registro LMP", "sin límite numérico", "unidad distinta", "excede", "revisar"],
+            default="cumple",
+        )
+        return cruce.drop(columns=["_merge", "_fila"])
+
+
+def _build_index(columna):
+    return dict(columna.groupby(columna, sort=False).indices)
+
+
+def _sample_limits(records):
+    """Límites para el cruce, con una fila sin ``facility`` por sector/contaminante.
+
+    Donde la norma solo fija límites por tipo de instalación, la fila sin
+    ``facility`` repite la variante con el máximo más bajo.
+    """
+    limites = records[["sector", "pollutant", "facility", "min_value", "max_value", "unit", "norm"]].copy()
+    limites["facility"] = limites["facility"].astype("string")
+    limites["facility_lmp"] = limites["facility"].fillna(LIMITE_GENERAL)
+    sin_tipo = limites["facility"].isna()
+    claves = ["sector", "pollutant"]
+    generales = limites.loc[sin_tipo, claves].drop_duplicates()
+    variantes = limites[~sin_tipo].merge(generales, on=claves, how="left", indicator=True)
+    variantes = variantes[variantes["_merge"] == "left_only"].drop(columns="_merge")
+    estrictas = (
+        variantes.sort_values("max_value", kind="stable", na_position="last")
+        .drop_duplicates(claves)
+        .assign(facility=pd.NA)
+    )
+    estrictas["facility"] = estrictas["facility"].astype("string")
+    return pd.concat([limites, estrictas], ignore_index=True)
@@ -0,0 +1,165 @@
+"""Evaluación de redes de estaciones repartida en un pool de procesos.
+
+Cada estación se evalúa de forma independiente con
+:func:`~calidad_aire.cumplimiento.evaluate_compliance`, pero la rejilla ancha
+rinde más cuantas más estaciones procesa en una llamada: las estaciones se
+agrupan en unos ``max_workers`` lotes (una sola llamada si hay un solo
+proceso) y los resultados se devuelven a medida que termina cada lote. El
+pool de procesos se crea una vez y se reutiliza entre evaluaciones; si no
+puede crearse (entornos sin ``spawn``, límites del contenedor) se continúa en
+el mismo proceso.
+
+Los datos pueden pasarse como DataFrame o como la ruta del Parquet de
+:func:`~calidad_aire.ingesta.monitoring_source`; con la ruta cada lote lee
+solo sus estaciones (a lo sumo ``ESTACIONES_POR_LOTE``), así que la memoria
+queda acotada por el lote y no por el archivo.
+"""
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from calidad_aire.cumplimiento import ComplianceResult, empty_result, evaluate_compliance
+from calidad_aire.ingesta import is_parquet_source, load_monitoring, source_stations
+
+# Estaciones por lote al leer desde un Parquet (acota la memoria de cada lectura)
+ESTACIONES_POR_LOTE = 8
+
+_POOL = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def split_by_station(data):
+    """{estación: filas de esa estación}, sin estaciones vacías."""
+    return {
+        station: grupo
+        for station, grupo in data.groupby("station", observed=True, sort=True)
+    }
+
+
+def station_batches(stations, n_batches):
+    """Reparte ``stations`` (ordenadas) en hasta ``n_batches`` lotes contiguos no vacíos."""
+    stations = sorted(stations)
+    n_batches = max(1, min(n_batches, len(stations)))
+    return [list(lote) for lote in np.array_split(np.array(stations, dtype=object), n_batches)]
+
+
+def shared_pool(workers):
+    """Pool de procesos compartido; se recrea solo si cambia ``workers``."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            # "spawn" evita heredar los hilos del servidor (Streamlit) al hacer fork
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def _discard_pool(pool):
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL, _POOL_WORKERS = None, 0
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_batches(data, stations, eca_dict, history, max_workers):
+    """Genera ``(estaciones, ComplianceResult)`` por lote, en orden de finalización.
+
+    Con ``max_workers=1`` (o una sola estación) todo corre en el proceso
+    actual, en una sola llamada si ``data`` es un DataFrame. Los lotes que el
+    pool no llegó a devolver se evalúan en proceso si el pool falla.
+    """
+    if not stations:
+        return
+    workers = min(max_workers or os.cpu_count() or 1, len(stations))
+    if is_parquet_source(data):
+        # Cada lote lee sus propias estaciones del Parquet
+        lotes = station_batches(stations, max(workers, math.ceil(len(stations) / ESTACIONES_POR_LOTE)))
+        pendientes = {tuple(lote): data for lote in lotes}
+    elif workers == 1:
+        pendientes = {tuple(stations): data}
+    else:
+        grupos = data.groupby("station", observed=True).indices
+        pendientes = {}
+        for lote in station_batches(stations, workers):
+            filas = np.sort(np.concatenate([grupos[s] for s in lote]))
+            pendientes[tuple(lote)] = data.iloc[filas]
+    if workers > 1:
+        try:
+            yield from _iter_pool(pendientes, eca_dict, history, workers)
+        except (BrokenProcessPool, OSError, NotImplementedError):
+            pass
+    for lote in list(pendientes):
+        yield list(lote), _evaluate_batch(pendientes.pop(lote), lote, eca_dict, history)
+
+
+def _evaluate_batch(fuente, estaciones, eca_dict, history):
+    if is_parquet_source(fuente):
+        fuente = load_monitoring(fuente, stations=estaciones)
+    return evaluate_compliance(fuente, eca_dict, history)
+
+
+def _iter_pool(pendientes, eca_dict, history, workers):
+    pool = shared_pool(workers)
+    futuros = {}
+    try:
+        for lote, fuente in pendientes.items():
+            futuros[pool.submit(_evaluate_batch, fuente, lote, eca_dict, history)] = lote
+        for futuro in as_completed(futuros):
+            lote = futuros[futuro]
+            resultado = futuro.result()
+            del pendientes[lote]
+            yield list(lote), resultado
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+    finally:
+        for futuro in futuros:
+            futuro.cancel()
+
+
+def merge_results(results):
+    """Une resultados por estación o por lote en un único :class:`ComplianceResult`."""
+    results = list(results)
+    if not results:
+        return empty_result()
+    if len(results) == 1:
+        averages, summary, invalid = results[0].averages, results[0].summary, results[0].invalid
+    else:
+        averages = pd.concat([r.averages for r in results], ignore_index=True)
+        summary = pd.concat([r.summary for r in results], ignore_index=True)
+        invalid = pd.concat([r.invalid for r in results], ignore_index=True)
+        # Las categorías difieren entre lotes: se vuelven a unificar
+        for col in ("station", "pollutant", "period", "unit"):
+            averages[col] = averages[col].astype("category")
+    summary = summary.sort_values(["station", "pollutant", "period"], ignore_index=True, kind="stable")
+    return ComplianceResult(averages=averages, summary=summary, invalid=invalid)
+
+
+def evaluate_network(data, eca_dict=None, history=None, max_workers=None, progress=None):
+    """Evalúa todas las estaciones y devuelve el resultado combinado.
+
+    ``data`` es un DataFrame de mediciones o la ruta de su Parquet en caché.
+    ``progress(hechas, total, estaciones, resultado)`` se llama cada vez que
+    termina un lote, con el número de estaciones evaluadas hasta ese momento,
+    para mostrar avance o resultados parciales.
+    """
+    stations = source_stations(data)
+    total = len(stations)
+    hechas = 0
+    resultados = []
+    for estaciones, resultado in _iter_batches(data, stations, eca_dict, history, max_workers):
+        resultados.append(resultado)
+        hechas += len(estaciones)
+        if progress is not None:
+            progress(hechas, total, estaciones, resultado)
+    return merge_results(resultados)
@@ -0,0 +1,306 @@
+"""Reportes PDF de cumplimiento por estación y periodo.
+
+Cada reporte incluye la tabla del ECA, el resumen de excedencias de la
+estación, las referencias legales de las normas citadas y una gráfica por
+contaminante (dibujada con las primitivas de FPDF, sin dependencias de
+renderizado de imágenes). Los reportes se generan como trabajos en segundo
+plano en un pool de procesos y se guardan en disco con el hash de sus
+entradas como nombre: pedir de nuevo un reporte sin cambios es inmediato.
+"""
+import importlib.util
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calidad_aire.cumplimiento import evaluate_compliance, hourly_grid
+from calidad_aire.graficas import downsample, eca_thresholds, marker_threshold
+from calidad_aire.hashing import content_hash, frame_hash
+from calidad_aire.lotes import split_by_station
+from calidad_aire.unidades import CANONICAL_UNIT
+
+# FPDF se importa al generar el primer reporte, no al cargar el módulo
+FPDF_AVAILABLE = importlib.util.find_spec("fpdf") is not None
+
+# Cambiar al modificar el contenido del reporte invalida los PDF en caché
+REPORT_VERSION = 2
+PUNTOS_GRAFICA = 400
+_CODIGO_NORMA = re.compile(r"\d{3,4}-\d{4}-[A-Z]+")
+# Las fuentes estándar de FPDF solo cubren latin-1
+_LATIN1 = str.maketrans({
+    "₀": "0", "₁": "1", "₂": "2", "₃": "3", "₄": "4", "₅": "5", "₆": "6", "₇": "7", "₈": "8", "₉": "9",
+    "—": "-", "–": "-", "…": "...", "“": '"', "”": '"', "‘": "'", "’": "'", "μ": "µ",
+})
+
+
+def _texto(valor):
+    return str(valor).translate(_LATIN1).encode("latin-1", "replace").decode("latin-1")
+
+
+def cited_norms(normas, sources):
+    """Entradas de ``normas`` cuyo código (p. ej. 003-2017-MINAM) aparece en ``sources``."""
+    codigos = {c for s in sources if s for c in _CODIGO_NORMA.findall(str(s))}
+    return {
+        nombre: datos for nombre, datos in normas.items()
+        if set(_CODIGO_NORMA.findall(nombre)) & codigos
+    }
+
+
+def period_day(valor):
+    """Límite de periodo (texto, ``date``, ``datetime`` o ``Timestamp``) como ``date``; None sin límite."""
+    if valor is None:
+        return None
+    return pd.Timestamp(valor).date()
+
+
+def report_key(station, data, eca_dict, normas, start=None, end=None):
+    """Hash de todas las entradas del reporte (nombre del PDF en caché).
+
+    Los límites del periodo se normalizan a ``date``: "2023-01-01" y
+    ``date(2023, 1, 1)`` dan el mismo reporte.
+    """
+    return content_hash(
+        REPORT_VERSION, station, period_day(start), period_day(end), eca_dict, normas, frame_hash(data)
+    )
+
+
+def select_period(data, start=None, end=None):
+    """Filas con ``start <= timestamp <= end`` (límites opcionales, ``end`` incluye el día)."""
+    ts = pd.to_datetime(data["timestamp"])
+    mask = np.ones(len(data), dtype=bool)
+    if start is not None:
+        mask &= (ts >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (ts < pd.Timestamp(end) + pd.Timedelta(days=1)).to_numpy()
+    return data[mask]
+
+
+def generate_report(path, station, data, eca_dict, normas, start=None, end=None):
+    """Evalúa ``data`` (una estación) y escribe el reporte en ``path``."""
+    if not FPDF_AVAILABLE:
+        raise RuntimeError("FPDF no está instalado (pip install fpdf2)")
+    from fpdf import FPDF
+
+    start, end = period_day(start), period_day(end)
+    resultado = evaluate_compliance(data, eca_dict)
+    unidad = CANONICAL_UNIT if "unit" in data.columns else None
+    grid = hourly_grid(data)
+
+    pdf = FPDF(orientation="P", unit="mm", format="A4")
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 15)
+    pdf.cell(0, 9, _texto(f"Reporte de calidad del aire - Estación {station}"), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", "", 10)
+    if len(grid):
+        periodo = f"{start or grid.index.min():%Y-%m-%d} a {end or grid.index.max():%Y-%m-%d}"
+    else:
+        periodo = "sin datos"
+    pdf.cell(0, 6, _texto(f"Periodo: {periodo}"), new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(3)
+
+    _seccion(pdf, "Estándares de Calidad Ambiental (ECA) para aire")
+    filas = [
+        (cont, per, f"{cell['value']:g}", cell.get("unit", ""), cell.get("source", ""))
+        for cont, periods in eca_dict.items() for per, cell in periods.items()
+    ]
+    _tabla(pdf, ("Contaminante", "Periodo", "Valor", "Unidad", "Norma"), filas, (38, 20, 20, 22, 80))
+
+    _seccion(pdf, "Resumen de excedencias")
+    resumen = resultado.summary
+    if resumen.empty:
+        pdf.multi_cell(0, 5, _texto("Sin mediciones de contaminantes con ECA en el periodo."),
+                       new_x="LMARGIN", new_y="NEXT")
+    else:
+        filas = [
+            (
+                r.pollutant, r.period, f"{r.limit:g} {r.unit}", r.n_valid, r.n_invalid, r.n_exceed,
+                "-" if pd.isna(r.max_value) else f"{r.max_value:.1f}",
+            )
+            for r in resumen.itertuples()
+        ]
+        _tabla(pdf, ("Contaminante", "Periodo", "Límite", "Válidos", "Inválidos", "Excedencias", "Máximo"),
+               filas, (34, 18, 34, 20, 22, 26, 26))
+        pdf.set_font("Helvetica", "I", 8)
+        pdf.multi_cell(0, 4, _texto(
+            "Promedios con menos del 75 % de horas con dato (6 de 8 h, 18 de 24 h, 75 % del año) "
+            "se cuentan como inválidos y no se comparan con el ECA."
+        ), new_x="LMARGIN", new_y="NEXT")
+
+    if len(resumen):
+        fuentes = set(resumen["source"])
+    else:
+        fuentes = {c.get("source") for periods in eca_dict.values() for c in periods.values()}
+    _seccion(pdf, "Referencias legales")
+    for nombre, datos in (cited_norms(normas, fuentes | {"010-2019-MINAM"}) or normas).items():
+        pdf.set_font("Helvetica", "B", 10)
+        titulo = f"{nombre} ({datos.get('Estado', '')}, {datos.get('Fecha de Publicación', '')})"
+        pdf.multi_cell(0, 5, _texto(titulo), new_x="LMARGIN", new_y="NEXT")
+        pdf.set_font("Helvetica", "", 9)
+        pdf.multi_cell(0, 4.5, _texto(datos.get("Resumen", "")), new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(1)
+
+    contaminantes = [c for c in grid.columns.get_level_values("pollutant").unique() if c in eca_dict]
+    if contaminantes:
+        pdf.add_page()
+        _seccion(pdf, "Concentraciones horarias vs. ECA")
+        for cont in contaminantes:
+            if pdf.get_y() + 70 > pdf.h - pdf.b_margin:
+                pdf.add_page()
+            _grafica(pdf, grid[(station, cont)], eca_thresholds(eca_dict, cont, unidad), f"{cont}")
+
+    temporal = f"{path}.tmp"
+    pdf.output(temporal)
+    os.replace(temporal, path)
+    return str(path)
+
+
+def _seccion(pdf, titulo):
+    pdf.ln(2)
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 7, _texto(titulo), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", "", 9)
+
+
+def _tabla(pdf, encabezado, filas, anchos):
+    pdf.set_font("Helvetica", "", 8)
+    with pdf.table(col_widths=anchos, width=sum(anchos), text_align="LEFT", line_height=4.5) as tabla:
+        for fila in [encabezado, *filas]:
+            celdas = tabla.row()
+            for valor in fila:
+                celdas.cell(_texto(valor))
+    pdf.ln(2)
+
+
+def _grafica(pdf, serie, lineas, titulo, alto=55):
+    """Serie horaria reducida con las líneas del ECA como discontinuas."""
+    x0, ancho = pdf.l_margin + 12, pdf.epw - 12
+    pdf.set_font("Helvetica", "B", 9)
+    unidad = lineas[0][2] if lineas else ""
+    pdf.cell(0, 5, _texto(f"{titulo} ({unidad})"), new_x="LMARGIN", new_y="NEXT")
+    y0 = pdf.get_y()
+    umbral, _ = marker_threshold(lineas)
+    serie = downsample(serie, PUNTOS_GRAFICA, keep_above=umbral)
+    pdf.set_draw_color(160, 160, 160)
+    pdf.rect(x0, y0, ancho, alto)
+    if serie.empty:
+        pdf.set_xy(x0, y0 + alto / 2)
+        pdf.cell(ancho, 5, "Sin datos", align="C")
+        pdf.set_xy(pdf.l_margin, y0 + alto + 4)
+        return
+    tope = max(serie.max(), *(valor for _, valor, _, _ in lineas)) * 1.05 or 1.0
+    t = serie.index.asi8.astype("float64")
+    rango_t = (t[-1] - t[0]) or 1.0
+
+    def escala_y(v):
+        return y0 + alto - alto * v / tope
+
+    px = x0 + ancho * (t - t[0]) / rango_t
+    py = escala_y(serie.to_numpy())
+    pdf.set_draw_color(31, 119, 180)
+    pdf.set_line_width(0.2)
+    pdf.polyline(list(zip(px.tolist(), py.tolist())))
+    pdf.set_draw_color(214, 39, 40)
+    pdf.set_dash_pattern(dash=1.5, gap=1)
+    pdf.set_font("Helvetica", "", 6)
+    for period, valor, unidad, _ in lineas:
+        y = escala_y(valor)
+        pdf.line(x0, y, x0 + ancho, y)
+        pdf.text(x0 + 1, y - 0.8, _texto(f"ECA {period}: {valor:g}"))
+    pdf.set_dash_pattern()
+    pdf.set_draw_color(0, 0, 0)
+    pdf.text(pdf.l_margin, y0 + 3, f"{tope:.0f}")
+    pdf.text(pdf.l_margin, y0 + alto, "0")
+    pdf.text(x0, y0 + alto + 3.5, f"{serie.index[0]:%Y-%m-%d}")
+    pdf.text(x0 + ancho - 14, y0 + alto + 3.5, f"{serie.index[-1]:%Y-%m-%d}")
+    pdf.set_xy(pdf.l_margin, y0 + alto + 6)
+
+
+@dataclass
+class ReportJob:
+    """Reporte pedido; ``future`` es None si ya estaba en caché."""
+
+    key: str
+    station: str
+    start: object
+    end: object
+    path: Path
+    future: object = None
+
+    @property
+    def state(self):
+        if self.future is None:
+            return "listo"
+        if not self.future.done():
+            return "generando" if self.future.running() else "en cola"
+        return "error" if self.future.exception() is not None else "listo"
+
+    @property
+    def error(self):
+        if self.future is not None and self.future.done():
+            return self.future.exception()
+        return None
+
+
+class ReportJobs:
+    """Cola de reportes PDF sobre un pool de procesos con caché en disco.
+
+    ``submit`` no bloquea: devuelve el trabajo de inmediato y el PDF se
+    escribe en ``cache_dir/<hash>.pdf`` al terminar. Si el pool de procesos
+    no está disponible se usa un pool de hilos.
+    """
+
+    def __init__(self, cache_dir, max_workers=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.jobs = {}
+        self._pool = None
+
+    def submit(self, station, data, eca_dict, normas, start=None, end=None):
+        """Encola el reporte de ``station`` (``data`` ya filtrado a esa estación)."""
+        start, end = period_day(start), period_day(end)
+        key = report_key(station, data, eca_dict, normas, start, end)
+        trabajo = self.jobs.get(key)
+        if trabajo is not None and trabajo.state != "error":
+            return trabajo
+        path = self.cache_dir / f"{key}.pdf"
+        trabajo = ReportJob(key, station, start, end, path)
+        if not path.exists():
+            trabajo.future = self._submit(generate_report, path, station, data, eca_dict, normas, start, end)
+        self.jobs[key] = trabajo
+        return trabajo
+
+    def submit_network(self, data, eca_dict, normas, start=None, end=None, stations=None):
+        """Un reporte por estación de ``data`` (o de ``stations``) para el periodo."""
+        periodo = select_period(data, start, end)
+        return [
+            self.submit(station, grupo, eca_dict, normas, start, end)
+            for station, grupo in split_by_station(periodo).items()
+            if stations is None or station in stations
+        ]
+
+    def pending(self):
+        return sum(t.state in ("en cola", "generando") for t in self.jobs.values())
+
+    def _submit(self, fn, *args):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        try:
+            return self._pool.submit(fn, *args)
+        except (BrokenProcessPool, OSError, NotImplementedError):
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._pool.submit(fn, *args)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,40 @@
+"""Tablas de presentación del ECA (Periodo × Contaminante)."""
+import pandas as pd
+
+
+def eca_to_df(eca_dict):
+    """Tabla ancha: una fila por periodo, una columna por contaminante (celdas del dict)."""
+    periodos = set()
+    for cont, periods in eca_dict.items():
+        for p in periods.keys():
+            periodos.add(p)
+    periodos = sorted(periodos)
+    table = {}
+    for p in periodos:
+        row = {}
+        for cont, periods in eca_dict.items():
+            if p in periods:
+                row[cont] = periods[p]
+            else:
+                row[cont] = None
+        table[p] = row
+    df = pd.DataFrame.from_dict(table, orient="index")
+    df.index.name = "Periodo"
+    return df
+
+
+def format_cell(cell):
+    """Texto de presentación de una celda: '50 µg/m³ (D.S. ...)' o '—'."""
+    if isinstance(cell, dict):
+        return f"{cell['value']} {cell['unit']} ({cell['source']})"
+    return "—"
+
+
+def numeric_cell(cell):
+    """Valor numérico de una celda; None si no hay."""
+    if isinstance(cell, dict):
+        try:
+            return float(cell["value"])
+        except Exception:
+            return None
+    return None
@@ -0,0 +1,145 @@
+"""Normalización de unidades de concentración a µg/m³.
+
+Las unidades de masa (ng/m³, µg/m³, mg/m³) se convierten con un factor fijo y
+las fracciones molares (ppb, ppm) con el peso molecular del gas y el volumen
+molar a las condiciones de referencia (25 °C, 1 atm por defecto). Los
+factores se calculan una vez por par (unidad, contaminante) distinto y la
+conversión masiva es una sola multiplicación vectorizada.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+CANONICAL_UNIT = "µg/m³"
+
+# Factor a µg/m³ de las unidades de masa por volumen
+_MASA = {"ng/m³": 1e-3, "µg/m³": 1.0, "mg/m³": 1e3, "g/m³": 1e6}
+# Factor a ppb de las fracciones molares
+_MOLAR = {"ppt": 1e-3, "ppb": 1.0, "ppm": 1e3}
+
+_ALIAS_UNIDADES = {
+    "ngm3": "ng/m³", "ugm3": "µg/m³", "mgm3": "mg/m³", "gm3": "g/m³",
+    "ppt": "ppt", "ppb": "ppb", "ppm": "ppm",
+}
+
+# g/mol, claves de ECA
+PESOS_MOLECULARES = {
+    "SO2": 64.066,
+    "NO2": 46.0055,
+    "CO": 28.010,
+    "O3": 47.997,
+    "C6H6 (Benceno)": 78.11,
+    "H2S": 34.08,
+}
+
+R_L_ATM = 0.082057  # L·atm/(mol·K)
+T_REFERENCIA_C = 25.0
+P_REFERENCIA_ATM = 1.0
+
+
+def normalize_unit(unit):
+    """Forma canónica de la unidad: 'ug/m3', 'μg/m³', 'µg m-3' → 'µg/m³'."""
+    texto = unicodedata.normalize("NFKC", str(unit)).lower()
+    texto = texto.replace("μ", "u").replace("µ", "u").replace("³", "3").replace("m-3", "m3")
+    clave = re.sub(r"[^a-z0-9]", "", texto)
+    try:
+        return _ALIAS_UNIDADES[clave]
+    except KeyError:
+        raise ValueError(f"Unidad de concentración no soportada: {unit!r}") from None
+
+
+def molar_volume(temperature_c=T_REFERENCIA_C, pressure_atm=P_REFERENCIA_ATM):
+    """Volumen molar del gas ideal en L/mol."""
+    return R_L_ATM * (temperature_c + 273.15) / pressure_atm
+
+
+@lru_cache(maxsize=None)
+def _factor_to_canonical(unit, pollutant):
+    unidad = normalize_unit(unit)
+    if unidad in _MASA:
+        return _MASA[unidad]
+    peso = PESOS_MOLECULARES.get(pollutant)
+    if peso is None:
+        raise ValueError(f"No se puede convertir {unidad} para {pollutant!r}: peso molecular desconocido")
+    # ppb → µg/m³: ppb × PM / Vm
+    return _MOLAR[unidad] * peso / molar_volume()
+
+
+def conversion_factor(from_unit, to_unit, pollutant=None):
+    """Factor multiplicativo de ``from_unit`` a ``to_unit``."""
+    return _factor_to_canonical(from_unit, pollutant) / _factor_to_canonical(to_unit, pollutant)
+
+
+def is_missing_unit(unit):
+    """True si la celda de unidad está vacía (None, NaN, NA o solo espacios)."""
+    if unit is None or (not isinstance(unit, str) and pd.isna(unit)):
+        return True
+    return not str(unit).strip()
+
+
+def eca_units(eca_dict):
+    """{contaminante: unidad} del ECA, para completar celdas de unidad vacías."""
+    return {
+        pollutant: cell["unit"]
+        for pollutant, periods in eca_dict.items()
+        for cell in periods.values()
+        if isinstance(cell, dict) and cell.get("unit")
+    }
+
+
+def canonical_factors(units, pollutants, n, default_units=None, errors="raise"):
+    """Factor a µg/m³ de cada una de las ``n`` filas.
+
+    Las unidades vacías toman la de ``default_units[pollutant]``. Con
+    ``errors="coerce"`` las unidades que no se pueden convertir (desconocidas,
+    o ppb para un contaminante sin peso molecular) dan NaN en vez de
+    ``ValueError``.
+    """
+    cod_u, unicas_u = _factorize(units, n)
+    cod_p, unicas_p = _factorize(pollutants, n)
+    # Códigos combinados (unidad, contaminante): unas pocas decenas de pares
+    codigos, pares = pd.factorize(cod_u * len(unicas_p) + cod_p)
+    factores = np.array([
+        _pair_factor(unicas_u[par // len(unicas_p)], unicas_p[par % len(unicas_p)], default_units, errors)
+        for par in pares
+    ], dtype="float64")
+    return factores[codigos]
+
+
+def _pair_factor(unit, pollutant, default_units, errors):
+    if is_missing_unit(unit):
+        unit = (default_units or {}).get(pollutant)
+        if unit is None:
+            if errors == "coerce":
+                return np.nan
+            raise ValueError(f"Falta la unidad de {pollutant!r} y no hay unidad ECA para completarla")
+    try:
+        return _factor_to_canonical(unit, pollutant)
+    except ValueError:
+        if errors == "coerce":
+            return np.nan
+        raise
+
+
+def to_canonical(values, units, pollutants=None, default_units=None, errors="raise"):
+    """Convierte ``values`` a µg/m³ en bloque.
+
+    ``units`` y ``pollutants`` pueden ser escalares o arrays alineados con
+    ``values``. Los factores se resuelven por combinación distinta
+    (factorize) y se aplican con una sola multiplicación. ``default_units`` y
+    ``errors`` se tratan como en :func:`canonical_factors`.
+    """
+    values = np.asarray(values, dtype="float64")
+    if np.ndim(units) == 0 and np.ndim(pollutants) == 0:
+        return values * _pair_factor(units, pollutants, default_units, errors)
+    return values * canonical_factors(units, pollutants, len(values), default_units, errors)
+
+
+def _factorize(valores, n):
+    if np.ndim(valores) == 0:
+        return np.zeros(n, dtype=np.int64), [valores]
+    codigos, unicos = pd.factorize(pd.Series(valores), use_na_sentinel=False)
+    return codigos.astype(np.int64), list(unicos)
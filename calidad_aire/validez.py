@@ -0,0 +1,52 @@
+"""Reglas de captura de datos (completitud) previas al promedio.
+
+El Protocolo Nacional de Monitoreo de la Calidad del Aire (D.S. N°
+010-2019-MINAM) exige un mínimo de datos válidos para que un promedio sea
+representativo; aquí se usa el 75 % de las horas de cada ventana: 6 de 8 h,
+18 de 24 h y el 75 % de las horas del año calendario.
+
+La completitud se calcula sobre la máscara booleana de presencia de la
+rejilla horaria completa (``grid.notna()``, un byte por hora y columna), para
+todas las estaciones y contaminantes a la vez.
+"""
+import numpy as np
+import pandas as pd
+
+UMBRAL_COMPLETITUD = 0.75
+
+
+def presence_mask(grid):
+    """Máscara booleana (horas × columnas) de horas con dato."""
+    return grid.notna().to_numpy()
+
+
+def _rolling_count(mask, n):
+    """Horas presentes en la ventana de ``n`` horas que termina en cada fila."""
+    acumulado = np.cumsum(mask, axis=0, dtype=np.int32)
+    conteo = acumulado.copy()
+    conteo[n:] -= acumulado[:-n]
+    return conteo
+
+
+def completeness(grid, period):
+    """Fracción de horas con dato de cada ventana, alineada con ``period_average``."""
+    mask = presence_mask(grid)
+    if period == "1h":
+        return pd.DataFrame(mask.astype("float32"), index=grid.index, columns=grid.columns)
+    if period == "8h":
+        return pd.DataFrame(_rolling_count(mask, 8) / 8.0, index=grid.index, columns=grid.columns)
+    presentes = pd.DataFrame(mask.astype("int16"), index=grid.index, columns=grid.columns)
+    if period == "24h":
+        return presentes.resample("D").sum() / 24.0
+    if period == "anual":
+        horas = presentes.resample("YS").sum()
+        esperadas = np.where(horas.index.is_leap_year, 8784.0, 8760.0)
+        return horas.div(esperadas, axis=0)
+    raise ValueError(f"Periodo no soportado: {period!r}")
+
+
+def min_hours(period, threshold=UMBRAL_COMPLETITUD, hours=None):
+    """Horas mínimas para validar una ventana de ``hours`` horas (por defecto la del periodo)."""
+    if hours is None:
+        hours = {"1h": 1, "8h": 8, "24h": 24, "anual": 8760}[period]
+    return int(np.ceil(threshold * hours))
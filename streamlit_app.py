@@ -1,15 +1,25 @@
 # streamlit_app.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from functools import partial
+from pathlib import Path
 from textwrap import dedent
 
-# Intentar importar FPDF para generar PDFs
-try:
-    from fpdf import FPDF
-    FPDF_AVAILABLE = True
-except Exception:
-    FPDF_AVAILABLE = False
+from calidad_aire.busqueda import PYPDF_AVAILABLE, load_or_build_index
+from calidad_aire.config import cache_dir
+from calidad_aire.cumplimiento import hourly_grid
+from calidad_aire.datos import ECA, LMP, NORMA_EXPLICACIONES, TIMELINE
+from calidad_aire.exportar import FORMATOS, available_formats, eca_table, export_frame
+from calidad_aire.graficas import concentration_figure, series_range, timeline_figure
+from calidad_aire.hashing import content_hash
+from calidad_aire.historico import current_history, current_norm, source_conflicts
+from calidad_aire.ingesta import is_parquet_source, load_monitoring, monitoring_source, unit_errors
+from calidad_aire.instrumentacion import Instrumentation
+from calidad_aire.lmp import LmpTable
+from calidad_aire.lotes import evaluate_network
+from calidad_aire.reportes import FPDF_AVAILABLE, ReportJobs
+from calidad_aire.tablas import eca_to_df, format_cell
+from calidad_aire.unidades import CANONICAL_UNIT
 
 # -------------------------
 # CONFIG
@@ -22,220 +32,108 @@ st.set_page_config(
 )
 
 # -------------------------
-# DATOS EMBEBIDOS (ECA, LMP, TIMELINE, NORMAS)
+# CACHÉ DE ARTEFACTOS DERIVADOS
 # -------------------------
-# ECA — Estándares de Calidad Ambiental para aire en Perú
-ECA = {
-    "PM2.5": {
-        "24h": {"value": 50, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"},
-        "anual": {"value": 25, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "PM10": {
-        "24h": {"value": 100, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"},
-        "anual": {"value": 50, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "SO2": {
-        "1h": {"value": 350, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"},
-        "24h": {"value": 125, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"},
-        "anual": {"value": 50, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "NO2": {
-        "1h": {"value": 200, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"},
-        "anual": {"value": 40, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "CO": {
-        "1h": {"value": 30, "unit": "mg/m³", "source": "D.S. N° 003-2017-MINAM"},
-        "8h": {"value": 10, "unit": "mg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "O3": {
-        "1h": {"value": 180, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"},
-        "8h": {"value": 100, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "Pb": {
-        "anual": {"value": 0.5, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "C6H6 (Benceno)": {
-        "anual": {"value": 5, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "As (Arsénico)": {
-        "anual": {"value": 6, "unit": "ng/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "Ni (Níquel)": {
-        "anual": {"value": 20, "unit": "ng/m³", "source": "D.S. N° 003-2017-MINAM"}
-    },
-    "Cd (Cadmio)": {
-        "anual": {"value": 5, "unit": "ng/m³", "source": "D.S. N° 003-2017-MINAM"}
-    }
-}
-
-
-# LMP — Límites Máximos Permisibles por sector industrial (completo)
-LMP = [
-    # 🧱 Industria del Cemento y Cal
-    {"Sector": "Cemento / Cal", "Parámetro": "Material Particulado Total (PM)", "Valor": "80 (nueva) / 120 (existente)", "Unidad": "mg/m³", "Norma": "D.S. N° 001-2020-MINAM"},
-    
-    # ⚡ Generación Termoeléctrica
-    {"Sector": "Generación Termoeléctrica", "Parámetro": "PM, NOx, SO₂", "Valor": "Varía según tecnología y potencia instalada", "Unidad": "mg/Nm³", "Norma": "D.S. N° 030-2021-MINAM"},
-    
-    # 🐟 Industria Pesquera
-    {"Sector": "Industria Pesquera (Harina y Aceite de Pescado)", "Parámetro": "Material Particulado Total (PM)", "Valor": "150", "Unidad": "mg/m³", "Norma": "D.S. N° 010-2008-PRODUCE"},
-    {"Sector": "Industria Pesquera (Harina y Aceite de Pescado)", "Parámetro": "Compuestos orgánicos volátiles (COV)", "Valor": "20", "Unidad": "mg/m³", "Norma": "D.S. N° 010-2008-PRODUCE"},
-
-    # 🔩 Industria Metalúrgica
-    {"Sector": "Metalurgia (Fundición y Refinación)", "Parámetro": "SO₂", "Valor": "2000", "Unidad": "mg/m³", "Norma": "D.S. N° 010-2010-MINAM"},
-    {"Sector": "Metalurgia (Fundición y Refinación)", "Parámetro": "Material Particulado (PM)", "Valor": "150", "Unidad": "mg/m³", "Norma": "D.S. N° 010-2010-MINAM"},
-    {"Sector": "Metalurgia (Fundición y Refinación)", "Parámetro": "Metales (As, Pb, Cd, Cu, Zn)", "Valor": "Valores específicos por elemento", "Unidad": "mg/m³", "Norma": "D.S. N° 010-2010-MINAM"},
-
-    # 🚗 Vehículos automotores
-    {"Sector": "Vehículos Automotores — Gasolina", "Parámetro": "CO, HC, NOx", "Valor": "Según norma Euro IV / EPA Tier 2", "Unidad": "g/km o g/kWh", "Norma": "D.S. N° 047-2001-MTC y modificatorias"},
-    {"Sector": "Vehículos Automotores — Diésel", "Parámetro": "PM, NOx, CO, HC", "Valor": "Según norma Euro IV / EPA Tier 2", "Unidad": "g/km o g/kWh", "Norma": "D.S. N° 047-2001-MTC y D.S. N° 010-2017-MINAM"},
-
-    # 🏭 Otras industrias
-    {"Sector": "Curtiembres", "Parámetro": "Material Particulado (PM)", "Valor": "150", "Unidad": "mg/m³", "Norma": "D.S. N° 003-2002-PRODUCE"},
-    {"Sector": "Industria del Papel", "Parámetro": "Material Particulado (PM)", "Valor": "150", "Unidad": "mg/m³", "Norma": "D.S. N° 003-2002-PRODUCE"},
-    {"Sector": "Industria Cervecera", "Parámetro": "Material Particulado (PM)", "Valor": "100", "Unidad": "mg/m³", "Norma": "D.S. N° 003-2002-PRODUCE"},
-
-    # 🛢️ Hidrocarburos (Refinerías y Plantas de Gas)
-    {"Sector": "Refinerías de Hidrocarburos", "Parámetro": "PM, SO₂, NOx, COV", "Valor": "Varía según proceso", "Unidad": "mg/Nm³", "Norma": "D.S. N° 010-2017-MINAM"},
-    {"Sector": "Plantas de Gas Natural y GLP", "Parámetro": "PM, SO₂, NOx", "Valor": "100-200 según contaminante", "Unidad": "mg/Nm³", "Norma": "D.S. N° 010-2017-MINAM"},
-
-    # ⛏️ Minería (Fundición y Plantas Concentradoras)
-    {"Sector": "Fundición de Minerales", "Parámetro": "PM, SO₂, Metales pesados (As, Pb, Cd, Cu, Zn)", "Valor": "150-200 / Valores específicos por elemento", "Unidad": "mg/Nm³", "Norma": "D.S. N° 010-2010-MINAM"},
-    {"Sector": "Plantas Concentradoras", "Parámetro": "Material Particulado (PM)", "Valor": "100", "Unidad": "mg/Nm³", "Norma": "D.S. N° 010-2010-MINAM"},
-]
-
-
-# Línea de tiempo
-TIMELINE = [
-    {"year": 2001, "norm": "DS N° 074-2001-PCM", "what": "Aprobación del Reglamento de Estándares Nacionales de Calidad Ambiental del Aire, estableciendo los primeros valores de referencia para contaminantes como PM10, CO, NO2, SO2, O3 y Pb."},
-    {"year": 2003, "norm": "DS N° 069-2003-PCM", "what": "Modificación del valor anual de concentración de plomo, estableciendo un límite de 0.5 µg/m³."},
-    {"year": 2008, "norm": "DS N° 003-2008-MINAM", "what": "Aprobación de los Estándares de Calidad Ambiental para Aire, actualizando los valores y parámetros con base en evidencia científica actualizada."},
-    {"year": 2013, "norm": "DS N° 006-2013-MINAM", "what": "Aprobación de disposiciones complementarias para la aplicación de estándares de calidad ambiental para dióxido de azufre."},
-    {"year": 2014, "norm": "DS N° 003-2014-MINAM", "what": "Establecimiento de procedimientos para la adecuación de los instrumentos de gestión a los nuevos ECA."},
-    {"year": 2017, "norm": "DS N° 003-2017-MINAM", "what": "Aprobación de nuevos Estándares de Calidad Ambiental para Aire, derogando normas anteriores y estableciendo valores más estrictos para contaminantes como PM2.5, PM10, SO2, NO2, CO, O3 y Pb."},
-    {"year": 2021, "norm": "DS N° 030-2021-MINAM", "what": "Aprobación de Límites Máximos Permisibles para emisiones de material particulado, NOx y SO2 en generación termoeléctrica, con valores diferenciados según tecnología."},
-    {"year": 2023, "norm": "RM N° 205-2023-MINAM", "what": "Aprobación de Límites Máximos Permisibles para emisiones de la industria de harina y aceite de pescado, estableciendo valores específicos para cada contaminante."},
-    {"year": 2025, "norm": "DS N° 045-2025-MINAM", "what": "Aprobación de nuevos Estándares de Calidad Ambiental para Aire, incorporando parámetros como benceno, arsénico, níquel y cadmio, con valores anuales establecidos para cada uno."}
-]
-
-# Resumen de normas legales relacionadas con la calidad del aire en Perú
-NORMA_EXPLICACIONES = {
-    "Ley N° 28611": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "28 de julio de 2005",
-        "Resumen": (
-            "Ley General del Ambiente. Constituye el marco normativo principal para la política ambiental en Perú, "
-            "reconociendo el derecho a un ambiente equilibrado y adecuado para la vida, salud y bienestar humano. "
-            "Establece los principios de prevención, precaución y responsabilidad ambiental, así como instrumentos "
-            "de gestión ambiental y promoción de participación ciudadana y educación ambiental."
-        ),
-        "Objetivo": (
-            "Garantizar la conservación y uso sostenible de los recursos naturales, integrar la dimensión ambiental "
-            "en las políticas públicas y asegurar la sostenibilidad del desarrollo económico y social. "
-            "Marco para la creación de estándares de calidad ambiental y regulación de emisiones contaminantes."
-        ),
-        "Antecedentes": "Primera Ley General del Ambiente en Perú, sirvió como base para normas sectoriales posteriores.",
-        "Aplicación": "Aplica a todos los sectores productivos, regulando planes y programas con impacto ambiental."
-    },
-    "Decreto Supremo N° 074-2001-PCM": {
-        "Estado": "Derogado",
-        "Fecha de Publicación": "22 de junio de 2001",
-        "Resumen": (
-            "Establece los estándares nacionales de calidad ambiental del aire para contaminantes SO₂, PM10, CO, NO₂, O₃ y Pb. "
-            "Fue la primera norma en fijar límites específicos para proteger la salud humana y el ambiente."
-        ),
-        "Objetivo": "Definir estándares de calidad del aire para proteger la salud y el ambiente. Fue reemplazado por DS N° 003-2017-MINAM.",
-        "Derogación": "Derogado por DS N° 003-2017-MINAM en 2017",
-        "Aplicación": "Principalmente aplicado a industrias, transporte y actividades urbanas antes de su derogación."
-    },
-    "Decreto Supremo N° 003-2017-MINAM": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "7 de junio de 2017",
-        "Resumen": (
-            "Aprueba los Estándares de Calidad Ambiental (ECA) para aire, incorporando PM2.5, metales pesados y nuevos valores "
-            "más estrictos, basados en evidencia científica y recomendaciones de la OMS."
-        ),
-        "Objetivo": "Actualizar los estándares de calidad del aire y proteger la salud pública y el medio ambiente frente a contaminantes.",
-        "Actualización": "Sustituye los límites de DS 074-2001-PCM y establece nuevos parámetros para monitoreo ambiental.",
-        "Aplicación": "Industria, transporte, áreas urbanas y monitoreo ambiental en todo el país."
-    },
-    "Decreto Supremo N° 017-2025-MINAM": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "2025",
-        "Resumen": "Define criterios técnicos y procedimientos para la gestión y monitoreo de la calidad del aire, incluyendo acreditación de laboratorios.",
-        "Objetivo": "Fortalecer la implementación de los estándares de calidad del aire y asegurar la confiabilidad de datos de monitoreo.",
-        "Aplicación": "Aplicable a laboratorios de monitoreo y autoridades ambientales regionales y locales."
-    },
-    "Decreto Supremo N° 010-2019-MINAM": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "2019",
-        "Resumen": "Aprueba el Protocolo Nacional de Monitoreo de la Calidad Ambiental del Aire para estandarizar mediciones y reportes.",
-        "Objetivo": "Generar información confiable y comparable sobre la calidad del aire en todo el país.",
-        "Aplicación": "Para todos los laboratorios de monitoreo y estudios de calidad ambiental en Perú."
-    },
-    "Decreto Supremo N° 030-2021-MINAM": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "2021",
-        "Resumen": "Aprueba los Límites Máximos Permisibles para emisiones de la generación termoeléctrica, estableciendo límites de PM, NOx y SO2.",
-        "Objetivo": "Proteger la calidad del aire y la salud pública limitando emisiones contaminantes de plantas termoeléctricas.",
-        "Aplicación": "Generación termoeléctrica en todo el territorio nacional."
-    },
-    "Decreto Supremo N° 011-2023-MINAM": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "2023",
-        "Resumen": "Aprueba los ECA de aire para cadmio, arsénico y cromo en PM10, incorporando estándares basados en riesgo sanitario.",
-        "Objetivo": "Proteger la salud humana y el medio ambiente mediante la regulación de metales pesados en el aire.",
-        "Aplicación": "Industria metalúrgica, minería y sectores con emisiones de metales pesados."
-    },
-    "Decreto Supremo N° 002-2025-MINAM": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "2025",
-        "Resumen": "Aprueba el Reglamento de la Ley N° 32099 sobre humedales, incluyendo su rol en la calidad del aire.",
-        "Objetivo": "Implementar medidas de conservación de humedales, que contribuyen a la purificación del aire y protección ecológica.",
-        "Aplicación": "Áreas naturales protegidas y humedales a nivel nacional."
-    },
-    "Decreto Supremo N° 0007-2024-MTC": {
-        "Estado": "Vigente",
-        "Fecha de Publicación": "2024",
-        "Resumen": "Aprueba el Reglamento de la Ley Nº 31595 para la descontaminación ambiental mediante retiro de cableado aéreo en mal estado.",
-        "Objetivo": "Reducir fuentes de contaminación y riesgos de incendios, mejorando la calidad del aire en zonas urbanas.",
-        "Aplicación": "Municipalidades, empresas de servicios eléctricos y zonas urbanas densamente pobladas."
-    }
-}
-# -------------------------
-# UTILIDADES
-# -------------------------
-def eca_to_df(eca_dict):
-    periodos = set()
-    for cont, periods in eca_dict.items():
-        for p in periods.keys():
-            periodos.add(p)
-    periodos = sorted(periodos)
-    table = {}
-    for p in periodos:
-        row = {}
-        for cont, periods in eca_dict.items():
-            if p in periods:
-                row[cont] = periods[p]
-            else:
-                row[cont] = None
-        table[p] = row
-    df = pd.DataFrame.from_dict(table, orient="index")
-    df.index.name = "Periodo"
-    return df
-
-def format_cell(cell):
-    if isinstance(cell, dict):
-        return f"{cell['value']} {cell['unit']} ({cell['source']})"
-    return "—"
-
-def numeric_cell(cell):
-    if isinstance(cell, dict):
-        try:
-            return float(cell["value"])
-        except Exception:
-            return None
-    return None
+# Las tablas y figuras derivadas de ECA, LMP y TIMELINE se calculan una sola vez
+# por versión de los datos y se comparten entre todas las sesiones. La clave es
+# la huella de contenido; los argumentos con "_" no se hashean en cada rerun.
+DATOS_HASH = content_hash(ECA, LMP, TIMELINE)
+CACHE_MAX_ENTRIES = 8
+
+# Métricas de la app (se muestran a pedido en la barra lateral). La instancia
+# vive en cache_resource para acumular entre reruns y sesiones; cada caché
+# cuenta llamadas y fallos a través de PERF.cached.
+@st.cache_resource
+def instrumentation():
+    return Instrumentation()
+
+PERF = instrumentation()
+
+@PERF.cached("eca_tables", st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False))
+def cached_eca_tables(datos_hash, _eca):
+    eca_df = eca_to_df(_eca)
+    return eca_df, eca_df.map(format_cell)
+
+@PERF.cached("lmp_df", st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False))
+def cached_lmp_df(datos_hash, _lmp):
+    return pd.DataFrame(_lmp)
+
+@PERF.cached("lmp_table", st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False))
+def cached_lmp_table(datos_hash, _lmp):
+    return LmpTable(_lmp)
+
+@PERF.cached("timeline_figure", st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False))
+def cached_timeline_figure(datos_hash, _timeline):
+    return timeline_figure(_timeline)
+
+# Historial de ECA: versiones derogadas + el ECA vigente (la última aprobación
+# de ECA para aire de la línea de tiempo).
+@PERF.cached("eca_history", st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False))
+def cached_eca_history(datos_hash, _eca, _timeline):
+    return current_history(_eca, _timeline)
+
+# Las mediciones subidas se vuelcan a Parquet (caché en disco) una sola vez por
+# archivo y se comparten sin copiar entre reruns (cache_resource). La evaluación
+# lee el Parquet por lotes de estaciones; las gráficas cargan el archivo entero.
+@PERF.cached("mediciones", st.cache_resource(max_entries=4, show_spinner="Procesando mediciones..."))
+def cached_fuente_mediciones(file_id, _archivo):
+    return monitoring_source(_archivo, cache_dir=cache_dir("mediciones"))
+
+@PERF.cached("mediciones_df", st.cache_resource(max_entries=4, show_spinner=False))
+def cached_mediciones(file_id, _fuente):
+    return load_monitoring(_fuente) if is_parquet_source(_fuente) else _fuente
+
+@PERF.cached("hourly_grid", st.cache_resource(max_entries=4, show_spinner=False))
+def cached_hourly_grid(file_id, _mediciones):
+    return hourly_grid(_mediciones)
+
+# Una figura por (estación, contaminante, rango visible): al volver a un rango
+# ya visto no se vuelve a reducir la serie ni a construir la figura.
+@PERF.cached("concentration_figure", st.cache_resource(max_entries=32, show_spinner=False))
+def cached_concentration_figure(datos_hash, file_id, station, pollutant, inicio, fin, unidad, _grid, _eca):
+    return concentration_figure(_grid, station, pollutant, _eca, start=inicio, end=fin, unit=unidad)
+
+# Índice de búsqueda sobre los PDF del repositorio: se carga de disco y solo se
+# reextrae el texto de los PDF modificados.
+PDF_DIR = Path(__file__).parent
+
+@PERF.cached("search_index", st.cache_resource(show_spinner="Indexando PDF normativos..."))
+def cached_search_index():
+    return load_or_build_index(PDF_DIR, cache_dir("busqueda"))
+
+# Cola de reportes PDF compartida por todas las sesiones; los PDF terminados
+# quedan en disco con el hash de sus entradas.
+@st.cache_resource(show_spinner=False)
+def report_jobs():
+    return ReportJobs(cache_dir("reportes"))
+
+def cargar_fuente(archivo):
+    """Parquet en caché (o DataFrame) del archivo subido; None si no se pudo leer."""
+    try:
+        return cached_fuente_mediciones(archivo.file_id, archivo)
+    except ValueError as e:
+        st.error(f"No se pudo leer el archivo de mediciones: {e}")
+        return None
+
+def avisar_unidades(mediciones):
+    """Advierte sobre las filas cuya unidad no se pudo convertir (quedan sin valor)."""
+    rechazadas = unit_errors(mediciones)
+    if len(rechazadas):
+        st.warning(f"{len(rechazadas):,} mediciones con unidad no convertible a µg/m³ se omitieron.")
+        with st.expander("Filas omitidas por unidad"):
+            st.dataframe(rechazadas.head(1000), use_container_width=True)
+
+def clear_derived_cache():
+    cached_eca_tables.clear()
+    cached_lmp_df.clear()
+    cached_lmp_table.clear()
+    cached_timeline_figure.clear()
+    cached_eca_history.clear()
+    cached_fuente_mediciones.clear()
+    cached_mediciones.clear()
+    cached_hourly_grid.clear()
+    cached_concentration_figure.clear()
+    cached_search_index.clear()
 
 # -------------------------
 # SIDEBAR
@@ -250,6 +148,19 @@ choice = st.sidebar.radio("Ir a:", [
     "Gráficas & Descargas"
 ])
 
+st.sidebar.markdown("---")
+archivo_mediciones = st.sidebar.file_uploader(
+    "📂 Datos de monitoreo (CSV: timestamp, station, pollutant, value[, unit])", type=["csv"]
+)
+
+if st.sidebar.button("🔄 Recalcular tablas y gráficos"):
+    clear_derived_cache()
+
+panel_reportes = st.sidebar.container()
+
+instrumentar = st.sidebar.checkbox("🧪 Instrumentación (tiempos, caché, memoria)")
+panel_instrumentacion = st.sidebar.container()
+
 st.sidebar.markdown("---")
 st.sidebar.write("**Autores:** Estudiantes de la carerra profesional de Ingenieria Ambiental de la Uiversidad Nacional de Moquegua")
 st.sidebar.write("**Curso:** Contaminacion y Control Atmosferica")
@@ -258,6 +169,8 @@ st.sidebar.markdown("---")
 # -------------------------
 # SECCIONES
 # -------------------------
+medicion = PERF.start(choice, memory=instrumentar)
+
 if choice == "Inicio":
     st.title("🌎 Marco Normativo Peruano de la Calidad del Aire")
 
@@ -321,33 +234,116 @@ elif choice == "Línea de tiempo":
     st.header("📜 Línea de tiempo — principales hitos normativos en calidad del aire")
     for item in TIMELINE:
         st.markdown(f"**{item['year']} — {item['norm']}**  \n• {item['what']}")
-    df_time = pd.DataFrame(TIMELINE)
-    df_time["y"] = range(len(df_time))
-    fig = px.scatter(df_time, x="year", y="y", text="norm", hover_data=["what"], height=400)
-    fig.update_yaxes(visible=False, showticklabels=False)
-    fig.update_layout(
-        xaxis_title="Año",
-        showlegend=False,
-        template="plotly_white",
-        margin=dict(l=20, r=20, t=30, b=20)
-    )
+    fig = cached_timeline_figure(DATOS_HASH, TIMELINE)
     st.plotly_chart(fig, use_container_width=True)
 
 elif choice == "ECA (Aire)":
     st.header("🌬️ Estándares de Calidad Ambiental (ECA) — Aire")
-    eca_df = eca_to_df(ECA)
-    eca_formatted = eca_df.applymap(format_cell)
+    eca_df, eca_formatted = cached_eca_tables(DATOS_HASH, ECA)
     st.markdown("#### 📋 Tabla: ECA (Periodo × Contaminante)")
     st.dataframe(eca_formatted, use_container_width=True)
 
+    eca_historia = cached_eca_history(DATOS_HASH, ECA, TIMELINE)
+    with st.expander("🕰️ ¿Qué ECA regía en una fecha determinada?"):
+        norma_vigente, vigente_desde = current_norm(TIMELINE)
+        conflictos = source_conflicts(ECA)
+        aviso = (f"La tabla principal se toma como el {norma_vigente} (última aprobación de ECA en la línea "
+                 f"de tiempo), vigente desde el {pd.Timestamp(vigente_desde):%d/%m/%Y}: solo se conoce el año, "
+                 "así que la fecha es supuesta.")
+        if len(conflictos):
+            ejemplos = "; ".join(
+                f"{c.pollutant} {c.period}: {c.value:g} vs. {c.cited_value:g} {c.unit}"
+                for c in conflictos.head(3).itertuples()
+            )
+            aviso += (f" Algunas celdas citan {conflictos['source'].iloc[0]}, pero su valor no coincide con "
+                      f"esa norma ({ejemplos}); antes de esa fecha se usan los valores de la norma citada.")
+        st.caption(aviso)
+        fecha = st.date_input("Fecha", value=pd.Timestamp("2005-01-01"),
+                              min_value=pd.Timestamp("2001-01-01"))
+        st.dataframe(eca_to_df(eca_historia.snapshot(fecha)).map(format_cell), use_container_width=True)
+
+    fuente = cargar_fuente(archivo_mediciones) if archivo_mediciones is not None else None
+    if fuente is not None:
+        st.markdown("#### ✅ Evaluación de cumplimiento de las mediciones cargadas")
+        avisar_unidades(fuente)
+        historico = st.checkbox("Comparar con el ECA vigente en la fecha de cada medición")
+        clave = (archivo_mediciones.file_id, historico)
+        if st.session_state.get("evaluacion", (None, None))[0] != clave:
+            # Estaciones repartidas en lotes en un pool de procesos; el resumen
+            # parcial se muestra a medida que cada lote termina.
+            barra = st.progress(0.0, text="Evaluando estaciones...")
+            parcial = st.empty()
+            resumenes = []
+
+            def mostrar_avance(hechas, total, estaciones, res):
+                resumenes.append(res.summary)
+                barra.progress(hechas / total, text=f"Estaciones evaluadas: {hechas}/{total}")
+                parcial.dataframe(pd.concat(resumenes, ignore_index=True), use_container_width=True)
+
+            if historico:
+                resultado = evaluate_network(fuente, history=eca_historia, progress=mostrar_avance)
+            else:
+                resultado = evaluate_network(fuente, ECA, progress=mostrar_avance)
+            barra.empty()
+            parcial.empty()
+            st.session_state["evaluacion"] = (clave, resultado)
+        resultado = st.session_state["evaluacion"][1]
+        st.dataframe(resultado.summary, use_container_width=True)
+        st.markdown(f"**Excedencias detectadas:** {len(resultado.exceedances)}")
+        st.dataframe(resultado.exceedances, use_container_width=True)
+        with st.expander(f"⚠️ Ventanas inválidas por captura de datos < 75 % ({len(resultado.invalid)})"):
+            st.caption("Promedios con menos de 6 de 8 h, 18 de 24 h o el 75 % de las horas del año: "
+                       "no se comparan con el ECA.")
+            st.dataframe(resultado.invalid, use_container_width=True)
+
 elif choice == "LMP por sector":
     st.header("🏭 Límites Máximos Permisibles (LMP) — Por sector")
-    lmp_df = pd.DataFrame(LMP)
-    st.dataframe(lmp_df, use_container_width=True)
+    lmp_tabla = cached_lmp_table(DATOS_HASH, LMP)
+
+    col1, col2, col3 = st.columns(3)
+    sectores = col1.multiselect("Sector", sorted(lmp_tabla.by_sector))
+    contaminantes = col2.multiselect("Contaminante", sorted(lmp_tabla.by_pollutant))
+    normas = col3.multiselect("Norma", sorted(lmp_tabla.by_norm))
+    registros = lmp_tabla.query(sectores or None, contaminantes or None, normas or None)
+    st.dataframe(registros.drop(columns=["parameter", "raw_value"]), use_container_width=True, hide_index=True)
+
+    with st.expander("📄 Tabla original (texto de la norma)"):
+        lmp_df = cached_lmp_df(DATOS_HASH, LMP)
+        st.dataframe(lmp_df, use_container_width=True)
+
+    st.markdown("#### 🏭 Verificar muestras de chimenea")
+    archivo_muestras = st.file_uploader("CSV de muestras (sector, pollutant, value[, facility][, unit])",
+                                        type=["csv"])
+    if archivo_muestras is not None:
+        try:
+            verificacion = lmp_tabla.check_samples(pd.read_csv(archivo_muestras))
+        except ValueError as error:
+            st.error(f"No se pudo verificar el archivo de muestras: {error}")
+        else:
+            st.dataframe(verificacion, use_container_width=True, hide_index=True)
+            st.markdown(f"**Muestras que exceden el LMP:** {(verificacion['status'] == 'excede').sum()}")
+            if (verificacion["status"] == "unidad distinta").any():
+                st.warning("Hay muestras en una unidad distinta a la del LMP (p. ej. mg/m³ frente a mg/Nm³): "
+                           "no se compararon; conviértalas a la unidad de la norma.")
 
 elif choice == "Decretos, Reglamentos y Leyes":
     st.header("📚 Decretos Supremos, Reglamentos y Leyes de Calidad del Aire en Perú")
 
+    consulta = st.text_input("🔎 Buscar en el texto de las normas (PDF)")
+    if consulta:
+        if not PYPDF_AVAILABLE:
+            st.info("Instale `pypdf` para habilitar la búsqueda en los PDF.")
+        else:
+            indice = cached_search_index()
+            resultados = indice.search(consulta)
+            if not resultados:
+                st.write("Sin resultados.")
+            for r in resultados:
+                st.markdown(f"**{r['document']} — {r['title']}** (pág. {r['page']})  \n{r['snippet']}")
+            if indice.unindexed:
+                st.caption("PDF sin texto extraíble (escaneados): " + ", ".join(indice.unindexed))
+        st.markdown("---")
+
     for norma, datos in NORMA_EXPLICACIONES.items():
         st.subheader(norma)
 
@@ -369,7 +365,97 @@ elif choice == "Decretos, Reglamentos y Leyes":
         st.markdown(texto)
 elif choice == "Gráficas & Descargas":
     st.header("📊 Gráficas y descargas")
-    eca_df = eca_to_df(ECA)
-    eca_formatted = eca_df.applymap(format_cell)
+    eca_df, eca_formatted = cached_eca_tables(DATOS_HASH, ECA)
     st.dataframe(eca_formatted, use_container_width=True)
-    st.download_button("📥 Descargar ECA (CSV)", eca_formatted.to_csv(index=True), file_name="eca_table.csv", mime="text/csv")
+
+    fuente = cargar_fuente(archivo_mediciones) if archivo_mediciones is not None else None
+    if fuente is not None:
+        st.markdown("#### 📈 Concentración horaria vs. ECA")
+        avisar_unidades(fuente)
+        mediciones = cached_mediciones(archivo_mediciones.file_id, fuente)
+        grilla = cached_hourly_grid(archivo_mediciones.file_id, mediciones)
+        if grilla.empty:
+            st.info("El archivo no tiene mediciones válidas.")
+        else:
+            col1, col2 = st.columns(2)
+            estacion = col1.selectbox("Estación", grilla.columns.unique("station"))
+            contaminantes = sorted(grilla[estacion].columns[grilla[estacion].notna().any()])
+            contaminante = col2.selectbox("Contaminante", contaminantes)
+            primero, ultimo = series_range(grilla)
+            inicio, fin = st.slider(
+                "Rango visible (la serie se reduce a ~2 000 puntos conservando los picos sobre el ECA)",
+                min_value=primero.to_pydatetime(), max_value=ultimo.to_pydatetime(),
+                value=(primero.to_pydatetime(), ultimo.to_pydatetime()),
+                step=pd.Timedelta(days=1).to_pytimedelta(), format="YYYY-MM-DD",
+            )
+            unidad = CANONICAL_UNIT if "unit" in mediciones.columns else None
+            fig = cached_concentration_figure(
+                DATOS_HASH, archivo_mediciones.file_id, estacion, contaminante,
+                pd.Timestamp(inicio), pd.Timestamp(fin), unidad, grilla, ECA,
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            st.markdown("#### 🧾 Reportes PDF por estación")
+            if not FPDF_AVAILABLE:
+                st.info("Instala fpdf2 para generar reportes PDF.")
+            else:
+                estaciones = st.multiselect("Estaciones", list(grilla.columns.unique("station")),
+                                            default=list(grilla.columns.unique("station")))
+                periodo = st.date_input("Periodo del reporte", value=(primero.date(), grilla.index.max().date()))
+                if st.button("Generar reportes") and len(periodo) == 2:
+                    # Cada estación es un trabajo en segundo plano: la página sigue
+                    # respondiendo y el avance se ve en el panel de la barra lateral.
+                    report_jobs().submit_network(mediciones, ECA, NORMA_EXPLICACIONES,
+                                                 start=periodo[0], end=periodo[1], stations=estaciones)
+
+    st.markdown("#### 📥 Descargas")
+    formato = st.radio("Formato", available_formats(), horizontal=True,
+                       format_func=lambda f: {"csv": "CSV", "parquet": "Parquet (zstd)", "xlsx": "Excel (XLSX)"}[f])
+    mime, extension = FORMATOS[formato]
+    # Los archivos se generan por bloques solo al hacer clic (data como callable)
+    descargas = {"eca_table": eca_table(ECA)}
+    evaluacion = st.session_state.get("evaluacion")
+    if archivo_mediciones is not None and evaluacion and evaluacion[0][0] == archivo_mediciones.file_id:
+        descargas["promedios"] = evaluacion[1].averages
+        descargas["excedencias"] = evaluacion[1].exceedances
+    elif archivo_mediciones is not None:
+        st.caption("Evalúa las mediciones en la sección ECA (Aire) para descargar promedios y excedencias.")
+    for nombre, tabla in descargas.items():
+        st.download_button(f"📥 Descargar {nombre} ({len(tabla):,} filas)", partial(export_frame, tabla, formato),
+                           file_name=f"{nombre}{extension}", mime=mime, key=f"descarga_{nombre}")
+
+PERF.stop(medicion)
+
+# -------------------------
+# PANEL DE REPORTES (barra lateral)
+# -------------------------
+def mostrar_reportes():
+    trabajos = list(report_jobs().jobs.values())[-10:]
+    if not trabajos:
+        return
+    st.markdown("**🧾 Reportes PDF**")
+    iconos = {"en cola": "⏳", "generando": "⚙️", "listo": "✅", "error": "❌"}
+    for trabajo in reversed(trabajos):
+        etiqueta = f"{iconos[trabajo.state]} {trabajo.station} ({trabajo.start} a {trabajo.end})"
+        if trabajo.state == "listo":
+            st.download_button(etiqueta, trabajo.path.read_bytes, key=trabajo.key,
+                               file_name=f"reporte_{trabajo.station}_{trabajo.start}_{trabajo.end}.pdf",
+                               mime="application/pdf")
+        else:
+            st.caption(etiqueta if trabajo.state != "error" else f"{etiqueta}: {trabajo.error}")
+
+# Mientras haya trabajos pendientes el panel se refresca solo, sin rerun de la página
+with panel_reportes:
+    st.fragment(mostrar_reportes, run_every=2 if report_jobs().pending() else None)()
+
+# -------------------------
+# INSTRUMENTACIÓN (barra lateral, opcional)
+# -------------------------
+if instrumentar:
+    with panel_instrumentacion:
+        st.caption("Tiempos del script por sección (acumulados en este servidor); "
+                   "la memoria pico se mide con tracemalloc solo mientras esta opción está activa.")
+        st.dataframe(PERF.section_table(), hide_index=True, use_container_width=True)
+        st.dataframe(PERF.cache_table(), hide_index=True, use_container_width=True)
+        if st.button("Reiniciar métricas"):
+            PERF.reset()
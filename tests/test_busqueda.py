@@ -0,0 +1,31 @@
+import pytest
+
+from calidad_aire.busqueda import extract_articles
+
+pytest.importorskip("pypdf")
+fpdf = pytest.importorskip("fpdf")
+
+
+def _pdf(path, lineas):
+    pdf = fpdf.FPDF()
+    pdf.add_page()
+    pdf.set_font("helvetica", size=10)
+    for linea in lineas:
+        pdf.cell(0, 6, linea, new_x="LMARGIN", new_y="NEXT")
+    pdf.output(str(path))
+    return path
+
+
+def test_solo_los_encabezados_cortan_articulos(tmp_path):
+    ruta = _pdf(tmp_path / "norma.pdf", [
+        "DECRETO SUPREMO",
+        "Artículo 1°.- Objeto",
+        "Aprobar los estandares conforme al",
+        "artículo 12 del reglamento y al",
+        "Artículo 33 de la Ley General del Ambiente.",
+        "Artículo 2 .- Vigencia",
+        "Rige desde su publicacion.",
+    ])
+    unidades = extract_articles(ruta)
+    assert [u["title"] for u in unidades] == ["Preámbulo", "Artículo 1", "Artículo 2"]
+    assert "Artículo 33 de la Ley" in unidades[1]["text"]
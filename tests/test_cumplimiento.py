@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.cumplimiento import evaluate_compliance, hourly_grid, period_average
+
+ECA_PRUEBA = {
+    "SO2": {
+        "1h": {"value": 100, "unit": "µg/m³", "source": "prueba"},
+        "24h": {"value": 50, "unit": "µg/m³", "source": "prueba"},
+    },
+    "CO": {"8h": {"value": 10, "unit": "µg/m³", "source": "prueba"}},
+    "PM10": {"anual": {"value": 50, "unit": "µg/m³", "source": "prueba"}},
+}
+
+
+def _serie(pollutant, horas, valores, station="A"):
+    return pd.DataFrame({"timestamp": horas, "station": station, "pollutant": pollutant, "value": valores})
+
+
+def test_rejilla_horaria_completa_y_promedia_repetidos():
+    data = _serie("SO2", pd.to_datetime(["2024-01-01 00:10", "2024-01-01 00:50", "2024-01-01 03:00"]),
+                  [10.0, 20.0, 5.0])
+    grid = hourly_grid(data)
+    assert len(grid) == 4
+    np.testing.assert_allclose(grid[("A", "SO2")], [15.0, np.nan, np.nan, 5.0])
+
+
+def test_media_movil_8h_etiquetada_al_final_de_la_ventana():
+    horas = pd.date_range("2024-01-01", periods=10, freq="h")
+    grid = hourly_grid(_serie("CO", horas, np.arange(1.0, 11.0)))
+    ocho = period_average(grid, "8h")[("A", "CO")]
+    assert ocho[horas[7]] == pytest.approx(4.5)   # horas 1..8
+    assert ocho[horas[9]] == pytest.approx(6.5)   # horas 3..10
+    assert ocho[horas[0]] == pytest.approx(1.0)   # min_periods=1; la completitud la descarta después
+
+
+def test_medias_diaria_y_anual_por_calendario():
+    horas = pd.date_range("2023-12-31", "2024-01-01 23:00", freq="h")
+    valores = np.where(horas.year == 2023, 10.0, 30.0)
+    grid = hourly_grid(_serie("SO2", horas, valores))
+    diaria = period_average(grid, "24h")[("A", "SO2")]
+    anual = period_average(grid, "anual")[("A", "SO2")]
+    assert list(diaria.index) == [pd.Timestamp("2023-12-31"), pd.Timestamp("2024-01-01")]
+    np.testing.assert_allclose(diaria, [10.0, 30.0])
+    np.testing.assert_allclose(anual, [10.0, 30.0])
+    with pytest.raises(ValueError):
+        period_average(grid, "mensual")
+
+
+def test_excedencia_estrictamente_mayor():
+    horas = pd.date_range("2024-01-01", periods=3, freq="h")
+    data = _serie("SO2", horas, [100.0, 100.001, 99.0])
+    resultado = evaluate_compliance(data, {"SO2": {"1h": ECA_PRUEBA["SO2"]["1h"]}})
+    assert list(resultado.exceedances["timestamp"]) == [horas[1]]
+    fila = resultado.summary.iloc[0]
+    assert (fila["n_valid"], fila["n_exceed"], fila["max_value"]) == (3, 1, pytest.approx(100.001))
+
+
+def test_completitud_descarta_dias_incompletos():
+    dia_completo = pd.date_range("2024-01-01", periods=18, freq="h")  # 18 de 24 h: válido
+    dia_corto = pd.date_range("2024-01-02", periods=17, freq="h")     # 17 de 24 h: inválido
+    data = _serie("SO2", dia_completo.append(dia_corto), 80.0)
+    resultado = evaluate_compliance(data, {"SO2": {"24h": ECA_PRUEBA["SO2"]["24h"]}})
+    assert list(resultado.exceedances["timestamp"]) == [pd.Timestamp("2024-01-01")]
+    assert list(resultado.invalid["timestamp"]) == [pd.Timestamp("2024-01-02")]
+    sin_regla = evaluate_compliance(data, {"SO2": {"24h": ECA_PRUEBA["SO2"]["24h"]}}, threshold=None)
+    assert len(sin_regla.exceedances) == 2 and sin_regla.invalid.empty
+
+
+def test_unidades_de_los_datos_se_normalizan():
+    horas = pd.date_range("2024-01-01", periods=8, freq="h")
+    data = _serie("CO", horas, 0.02).assign(unit="mg/m³")  # 20 µg/m³ > 10 µg/m³
+    resultado = evaluate_compliance(data, ECA_PRUEBA)
+    ocho = resultado.averages[resultado.averages["period"] == "8h"]
+    assert ocho["exceeds"].sum() == 3  # ventanas con al menos 6 de 8 h
+    assert set(ocho["unit"].astype(str)) == {"µg/m³"}
+
+
+def test_entrada_vacia():
+    vacio = pd.DataFrame(columns=["timestamp", "station", "pollutant", "value"])
+    resultado = evaluate_compliance(vacio, ECA_PRUEBA)
+    assert resultado.averages.empty and resultado.summary.empty and resultado.invalid.empty
+    assert list(resultado.exceedances.columns) == list(resultado.averages.columns)
+
+
+def test_errores_de_entrada():
+    with pytest.raises(ValueError, match="Faltan columnas"):
+        evaluate_compliance(pd.DataFrame({"timestamp": [], "value": []}), ECA_PRUEBA)
+    with pytest.raises(ValueError):
+        evaluate_compliance(_serie("SO2", [pd.Timestamp("2024-01-01")], [1.0]))
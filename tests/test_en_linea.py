@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.cumplimiento import evaluate_compliance
+from calidad_aire.en_linea import OnlineEvaluator
+
+ECA_PRUEBA = {
+    "CO": {
+        "1h": {"value": 30, "unit": "µg/m³", "source": "prueba"},
+        "8h": {"value": 10, "unit": "µg/m³", "source": "prueba"},
+    },
+    "PM10": {
+        "24h": {"value": 100, "unit": "µg/m³", "source": "prueba"},
+        "anual": {"value": 50, "unit": "µg/m³", "source": "prueba"},
+    },
+}
+
+
+def _serie(pollutant, horas, valores, station="A"):
+    return pd.DataFrame({"timestamp": horas, "station": station, "pollutant": pollutant, "value": valores})
+
+
+def _cerradas(tabla, ultima):
+    """Filas de ventanas que el evaluador en línea ya pudo cerrar antes de ``ultima``."""
+    inicio = {
+        "1h": ultima, "8h": ultima,
+        "24h": ultima.floor("D"),
+        "anual": pd.Timestamp(year=ultima.year, month=1, day=1),
+    }
+    limite = tabla["period"].astype(str).map(inicio)
+    return tabla[(tabla["timestamp"] < limite) | tabla["period"].isin(["1h", "8h"])]
+
+
+def _en_linea(data, checkpoint=None):
+    """Eventos e invalidas del evaluador en línea, con un reinicio a la mitad si hay ``checkpoint``."""
+    data = data.sort_values("timestamp", kind="stable")
+    mitad = len(data) // 2 if checkpoint else len(data)
+    evaluador = OnlineEvaluator(ECA_PRUEBA)
+    eventos = evaluador.update_frame(data.iloc[:mitad])
+    if checkpoint:
+        evaluador.save(checkpoint)
+        evaluador = OnlineEvaluator.load(checkpoint, ECA_PRUEBA)
+        eventos += evaluador.update_frame(data.iloc[mitad:])
+    return pd.DataFrame(eventos, columns=["station", "pollutant", "period", "timestamp", "value",
+                                          "limit", "unit", "source"]), evaluador
+
+
+def _claves(tabla):
+    return sorted(zip(tabla["pollutant"].astype(str), tabla["period"].astype(str), tabla["timestamp"]))
+
+
+def test_hueco_largo_no_adelanta_lecturas_viejas():
+    horas = pd.date_range("2024-01-01", periods=24, freq="h")
+    valores = [1.0] * 16 + [20.0] * 8
+    data = pd.concat([
+        _serie("CO", horas, valores),
+        _serie("CO", [pd.Timestamp("2024-01-02 20:00")], [1.0]),
+    ], ignore_index=True)
+    eventos, _ = _en_linea(data)
+    lotes = evaluate_compliance(data, {"CO": {"8h": ECA_PRUEBA["CO"]["8h"]}}).exceedances
+    ocho = eventos[eventos["period"] == "8h"]
+    assert _claves(ocho) == _claves(lotes)
+    assert ocho["timestamp"].max() < pd.Timestamp("2024-01-02 08:00")
+
+
+@pytest.mark.parametrize("checkpoint", [False, True])
+def test_paridad_con_evaluate_compliance(tmp_path, checkpoint):
+    rng = np.random.default_rng(7)
+    horas = pd.date_range("2023-12-29", "2024-01-04 23:00", freq="h")
+    data = pd.concat([
+        _serie("CO", horas, rng.gamma(2.0, 5.0, len(horas))),
+        _serie("PM10", horas, rng.gamma(2.0, 45.0, len(horas))),
+    ], ignore_index=True)
+    # Horas sueltas sin dato y un hueco de 30 h que cruza el cambio de año,
+    # precedido de valores altos y cerrado por una lectura
+    cerca = data["timestamp"].between("2023-12-31 02:00", "2024-01-01 16:00")
+    data = data.drop(data[~cerca].sample(frac=0.08, random_state=3).index)
+    previas = (data["pollutant"] == "CO") & data["timestamp"].between("2023-12-31 02:00", "2023-12-31 09:00")
+    data.loc[previas, "value"] = 20.0
+    hueco = data["timestamp"].between("2023-12-31 10:00", "2024-01-01 15:00")
+    data = data[~hueco]
+
+    eventos, evaluador = _en_linea(data, tmp_path / "estado.json" if checkpoint else None)
+    lotes = evaluate_compliance(data, ECA_PRUEBA)
+    ultima = data["timestamp"].max()
+
+    assert _claves(eventos) == _claves(_cerradas(lotes.exceedances, ultima))
+    assert evaluador.invalid == len(_cerradas(lotes.invalid, ultima))
+    assert evaluador.skipped == 0
+
+
+def test_unidad_nan_usa_la_del_eca():
+    evaluador = OnlineEvaluator(ECA_PRUEBA)
+    eventos = evaluador.update("A", "CO", "2024-01-01 00:00", 40.0, float("nan"))
+    assert [(e.period, e.value) for e in eventos] == [("1h", 40.0)]
@@ -0,0 +1,28 @@
+import io
+
+import pandas as pd
+import pytest
+
+from calidad_aire.datos import ECA
+from calidad_aire.exportar import available_formats, eca_table, export_frame
+
+
+@pytest.mark.parametrize("fmt", available_formats())
+def test_export_frame_es_descargable_en_streamlit(fmt):
+    download_data_util = pytest.importorskip("streamlit.runtime.download_data_util")
+    tabla = eca_table(ECA)
+    archivo = export_frame(tabla, fmt)
+    with archivo:
+        contenido, _ = download_data_util.convert_data_to_bytes_and_infer_mime(
+            archivo, unsupported_error=TypeError(type(archivo))
+        )
+    assert contenido
+    if fmt == "csv":
+        leida = pd.read_csv(io.BytesIO(contenido))
+        assert len(leida) == len(tabla)
+        assert list(leida.columns) == list(tabla.columns)
+
+
+def test_export_frame_rechaza_formatos_desconocidos():
+    with pytest.raises(ValueError, match="no soportado"):
+        export_frame(eca_table(ECA), "ods")
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.datos import ECA
+from calidad_aire.graficas import concentration_figure, eca_thresholds, marker_threshold
+
+
+def test_marcadores_usan_el_eca_horario():
+    assert marker_threshold(eca_thresholds(ECA, "CO", "µg/m³")) == (30000.0, "Sobre el ECA 1h")
+    valor, nombre = marker_threshold(eca_thresholds(ECA, "PM10"))
+    assert valor == 50.0 and "referencia más exigente" in nombre
+    assert marker_threshold([]) == (None, None)
+
+
+def test_figura_marca_solo_sobre_el_eca_horario():
+    pytest.importorskip("plotly")
+    horas = pd.date_range("2024-01-01", periods=48, freq="h")
+    serie = np.full(len(horas), 200.0)  # sobre el ECA 24h de SO2 (125), bajo el 1h (350)
+    serie[10] = 400.0
+    grid = pd.DataFrame({("A", "SO2"): serie}, index=horas)
+    grid.columns = pd.MultiIndex.from_tuples(grid.columns, names=["station", "pollutant"])
+    fig = concentration_figure(grid, "A", "SO2", ECA)
+    marcas = [t for t in fig.data if t.mode == "markers"]
+    assert marcas[0].name == "Sobre el ECA 1h"
+    assert list(marcas[0].y) == [400.0]
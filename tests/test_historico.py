@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from calidad_aire.datos import ECA, TIMELINE
+from calidad_aire.historico import current_history, current_norm, source_conflicts
+
+
+def test_norma_vigente_sale_de_la_linea_de_tiempo():
+    assert current_norm(TIMELINE) == ("DS N° 045-2025-MINAM", "2025-01-01")
+    # Las entradas de LMP posteriores no cuentan como ECA
+    extra = TIMELINE + [{"year": 2030, "norm": "DS N° 999-2030-MINAM", "what": "Límites Máximos Permisibles."}]
+    assert current_norm(extra)[0] == "DS N° 045-2025-MINAM"
+
+
+def test_conflictos_de_cita():
+    conflictos = source_conflicts(ECA)
+    fila = conflictos[(conflictos["pollutant"] == "SO2") & (conflictos["period"] == "24h")].iloc[0]
+    assert (fila["value"], fila["cited_value"]) == (125, 250)
+    assert source_conflicts({"SO2": {"24h": {"value": 250, "unit": "µg/m³", "source": "D.S. N° 003-2017-MINAM"}}}).empty
+
+
+def test_historial_usa_la_fecha_de_la_linea_de_tiempo():
+    historia = current_history(ECA, TIMELINE)
+    antes = historia.snapshot(pd.Timestamp("2024-12-31"))["SO2"]["24h"]
+    despues = historia.snapshot(pd.Timestamp("2025-01-01"))["SO2"]["24h"]
+    assert (antes["value"], antes["source"]) == (250.0, "DS N° 003-2017-MINAM")
+    assert (despues["value"], despues["source"]) == (125.0, "DS N° 045-2025-MINAM")
+
+
+def test_limites_en_los_bordes_de_vigencia():
+    historia = current_history(ECA, TIMELINE)
+    fechas = pd.to_datetime([
+        "2001-06-23 00:00", "2001-06-24 00:00",  # antes / inicio del DS 074-2001-PCM
+        "2008-12-31 23:00", "2009-01-01 00:00",  # escalón del DS 003-2008-MINAM
+        "2013-12-31 23:00", "2014-01-01 00:00",
+        "2017-06-07 23:00", "2017-06-08 00:00",  # el DS 003-2017-MINAM deroga lo anterior
+    ])
+    valores, unidades, normas = historia.limits_at("SO2", "24h", fechas)
+    assert np.isnan(valores[0]) and normas[0] is None
+    np.testing.assert_allclose(valores[1:], [365, 365, 80, 80, 20, 20, 250])
+    assert list(normas[1:3]) == ["DS N° 074-2001-PCM"] * 2
+    assert normas[-1] == "DS N° 003-2017-MINAM" and unidades[-1] == "µg/m³"
+
+
+def test_lookup_vectorizado_por_clave():
+    historia = current_history(ECA, TIMELINE)
+    data = pd.DataFrame({
+        "timestamp": pd.to_datetime(["2016-01-01", "2018-01-01", "2016-01-01", "2000-01-01"]),
+        "pollutant": ["PM2.5", "PM2.5", "CO", "CO"],
+        "period": ["24h", "24h", "8h", "8h"],
+    }, index=[10, 11, 12, 13])
+    limite = historia.lookup(data)
+    assert list(limite.index) == [10, 11, 12, 13]
+    np.testing.assert_allclose(limite, [25, 50, 10, np.nan])
+    assert historia.limits_at("Xyz", "1h", data["timestamp"])[2].tolist() == [None] * 4
@@ -0,0 +1,69 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.ingesta import read_monitoring, read_monitoring_csv, unit_errors
+from calidad_aire.unidades import CANONICAL_UNIT
+
+CSV = b"""timestamp,estacion,contaminante,valor,unidad
+2024-01-01 00:00,A,CO,2,mg/m3
+2024-01-01 01:00,A,CO,3,
+2024-01-01 02:00,A,PM10,30,ppb
+2024-01-01 03:00,A,PM10,30,furlong
+2024-01-01 04:00,A,SO2,40,ug/m3
+"""
+
+
+@pytest.mark.parametrize("con_cache", [False, True])
+def test_unidades_vacias_y_desconocidas(tmp_path, con_cache):
+    if con_cache:
+        data = read_monitoring(io.BytesIO(CSV), cache_dir=tmp_path)
+    else:
+        data = read_monitoring_csv(io.BytesIO(CSV))
+    # La celda vacía de CO toma la unidad del ECA (mg/m³)
+    np.testing.assert_allclose(data["value"], [2000, 3000, np.nan, np.nan, 40])
+    rechazadas = unit_errors(data)
+    assert list(rechazadas["unit"].astype(str)) == ["ppb", "furlong"]
+    assert (data.drop(rechazadas.index)["unit"] == CANONICAL_UNIT).all()
+
+
+def test_sin_columna_de_unidad():
+    data = read_monitoring_csv(io.BytesIO(b"timestamp,station,pollutant,value\n2024-01-01,A,PM10,5\n"))
+    assert unit_errors(data).empty
+
+
+@pytest.mark.parametrize("con_cache", [False, True])
+def test_fecha_y_hora_en_columnas_separadas(tmp_path, con_cache):
+    csv = b"fecha,hora,estacion,contaminante,valor\n2024-01-01,01:00,A,PM10,10\n2024-01-01,24,A,PM10,500\n"
+    fuente = io.BytesIO(csv)
+    data = read_monitoring(fuente, cache_dir=tmp_path) if con_cache else read_monitoring_csv(fuente)
+    assert list(data["timestamp"]) == [pd.Timestamp("2024-01-01 01:00"), pd.Timestamp("2024-01-02 00:00")]
+
+
+def test_columnas_duplicadas_y_horas_invalidas():
+    with pytest.raises(ValueError, match="corresponden ambas"):
+        read_monitoring_csv(io.BytesIO(b"fecha,datetime,station,pollutant,value\n2024-01-01,2024-01-01,A,PM10,1\n"))
+    with pytest.raises(ValueError, match="Hora no reconocida"):
+        read_monitoring_csv(io.BytesIO(b"fecha,hora,station,pollutant,value\n2024-01-01,tarde,A,PM10,1\n"))
+
+
+@pytest.mark.parametrize("con_cache", [False, True])
+def test_fechas_con_desfase_quedan_en_hora_local(tmp_path, con_cache):
+    csv = (b"timestamp,station,pollutant,value\n"
+           b"2024-01-01T00:00:00-05:00,A,PM10,1\n2024-01-01T06:00:00Z,A,PM10,2\n")
+    fuente = io.BytesIO(csv)
+    data = read_monitoring(fuente, cache_dir=tmp_path) if con_cache else read_monitoring_csv(fuente)
+    assert list(data["timestamp"]) == [pd.Timestamp("2024-01-01 00:00"), pd.Timestamp("2024-01-01 01:00")]
+    with pytest.raises(ValueError, match="con y sin desfase"):
+        read_monitoring_csv(io.BytesIO(b"timestamp,station,pollutant,value\n"
+                                       b"2024-01-01T00:00:00,A,PM10,1\n2024-01-01T06:00:00Z,A,PM10,2\n"))
+
+
+@pytest.mark.parametrize("con_cache", [False, True])
+def test_csv_solo_con_encabezado(tmp_path, con_cache):
+    fuente = io.BytesIO(b"timestamp,station,pollutant,value\n")
+    with pytest.raises(ValueError, match="no contiene filas"):
+        read_monitoring(fuente, cache_dir=tmp_path) if con_cache else read_monitoring_csv(fuente)
+    assert not list(tmp_path.iterdir())
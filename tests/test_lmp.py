@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.datos import LMP
+from calidad_aire.lmp import LmpTable, normalize_lmp_unit, parse_parameter, parse_value, split_top_level
+
+
+@pytest.fixture(scope="module")
+def tabla():
+    return LmpTable(LMP)
+
+
+def test_muestras_sin_facility_usan_la_variante_mas_exigente(tabla):
+    muestras = pd.DataFrame({
+        "sector": ["Cemento / Cal"] * 4,
+        "pollutant": ["PM"] * 4,
+        "value": [100.0, 100.0, 100.0, 70.0],
+        "facility": [np.nan, " Existente ", "", np.nan],
+    })
+    cruce = tabla.check_samples(muestras)
+    assert list(cruce["max_value"]) == [80.0, 120.0, 80.0, 80.0]
+    assert list(cruce["facility_lmp"]) == ["nueva", "existente", "nueva", "nueva"]
+    assert list(cruce["status"]) == ["excede", "cumple", "excede", "cumple"]
+
+
+def test_columna_facility_toda_vacia(tabla):
+    muestras = pd.DataFrame({"sector": ["Cemento / Cal", "Inexistente"], "pollutant": ["PM", "PM"],
+                             "value": [90.0, 1.0], "facility": [np.nan, np.nan]})
+    assert list(tabla.check_samples(muestras)["status"]) == ["excede", "sin registro LMP"]
+
+
+def test_facility_sin_limite_propio_usa_el_general_del_sector(tabla):
+    muestras = pd.DataFrame({
+        "sector": ["Curtiembres", "Curtiembres", "Cemento / Cal"],
+        "pollutant": ["PM", "PM", "PM"],
+        "value": [100.0, 200.0, 100.0],
+        "facility": ["nueva", "Existente", "existente"],
+    })
+    cruce = tabla.check_samples(muestras)
+    assert list(cruce["max_value"]) == [150.0, 150.0, 120.0]
+    assert list(cruce["facility_lmp"]) == ["general", "general", "existente"]
+    assert list(cruce["status"]) == ["cumple", "excede", "cumple"]
+
+
+def test_unidad_distinta_no_se_compara(tabla):
+    muestras = pd.DataFrame({
+        "sector": ["Fundición de Minerales", "Fundición de Minerales", "Curtiembres"],
+        "pollutant": ["PM", "PM", "PM"],
+        "value": [300.0, 300.0, 100.0],
+        "unit": ["mg/m3", " ", "mg/m³"],
+    })
+    cruce = tabla.check_samples(muestras)
+    assert cruce["unit"].tolist() == ["mg/Nm³", "mg/Nm³", "mg/m³"]
+    assert list(cruce["status"]) == ["unidad distinta", "excede", "cumple"]
+
+
+def test_muestras_invalidas_lanzan_value_error(tabla):
+    with pytest.raises(ValueError, match="faltan: pollutant"):
+        tabla.check_samples(pd.DataFrame({"sector": ["Curtiembres"], "value": [1.0]}))
+    with pytest.raises(ValueError, match="numérica"):
+        tabla.check_samples(pd.DataFrame({"sector": ["Curtiembres"], "pollutant": ["PM"], "value": ["alto"]}))
+
+
+def test_parse_value_rangos_variantes_y_texto():
+    assert parse_value("80 (nueva) / 120 (existente)") == [
+        {"min": 80.0, "max": 80.0, "facility": "nueva", "note": None},
+        {"min": 120.0, "max": 120.0, "facility": "existente", "note": None},
+    ]
+    rango = parse_value("100-200 según contaminante")[0]
+    assert (rango["min"], rango["max"], rango["note"]) == (100.0, 200.0, "según contaminante")
+    mixto = parse_value("150-200 / Valores específicos por elemento")
+    assert mixto[0]["max"] == 200.0 and np.isnan(mixto[1]["min"])
+    texto = parse_value("Según norma Euro IV / Tier 2")
+    assert len(texto) == 1 and texto[0]["note"] == "Según norma Euro IV / Tier 2"
+    assert parse_value("0,5")[0]["min"] == 0.5
+
+
+def test_parse_parameter_y_unidades():
+    assert parse_parameter("PM, SO₂, Metales pesados (As, Pb)") == [
+        ("PM", None), ("SO2", None), ("As", "Metales"), ("Pb", "Metales"),
+    ]
+    assert parse_parameter("Material Particulado Total (PM)") == [("PM", None)]
+    assert split_top_level("a (b / c) / d", "/") == ["a (b / c)", "d"]
+    assert normalize_lmp_unit("mg/Nm3") == "mg/Nm³"
+    assert normalize_lmp_unit("ug/m3 o ppm") == "µg/m³ | ppm"
+
+
+def test_parse_lmp_registros(tabla):
+    registros = tabla.records
+    cemento = registros[registros["sector"] == "Cemento / Cal"]
+    assert list(zip(cemento["facility"], cemento["max_value"])) == [("nueva", 80.0), ("existente", 120.0)]
+    termo = registros[registros["sector"].str.startswith("Generación")]
+    assert set(termo["pollutant"]) == {"PM", "NOx", "SO2"} and not termo["numeric"].any()
+    assert list(tabla.query(sectors=["Cemento / Cal"], pollutants=["PM"]).index) == list(cemento.index)
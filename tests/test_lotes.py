@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.cumplimiento import evaluate_compliance
+from calidad_aire.datos import ECA
+from calidad_aire.lotes import evaluate_network, station_batches
+
+
+def test_station_batches_contiguos():
+    assert station_batches(["c", "a", "b", "e", "d"], 2) == [["a", "b", "c"], ["d", "e"]]
+    assert station_batches(["a"], 4) == [["a"]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_evaluate_network_igual_a_una_llamada(workers):
+    rng = np.random.default_rng(1)
+    horas = pd.date_range("2024-01-01", periods=24 * 10, freq="h")
+    data = pd.concat([
+        pd.DataFrame({"timestamp": horas, "station": f"E{s}", "pollutant": p,
+                      "value": rng.gamma(2.0, 60.0, len(horas))})
+        for s in range(5) for p in ("SO2", "PM10")
+    ], ignore_index=True)
+    avances = []
+    resultado = evaluate_network(data, ECA, max_workers=workers,
+                                 progress=lambda hechas, total, estaciones, _: avances.append((hechas, total)))
+    esperado = evaluate_compliance(data, ECA)
+    assert avances[-1] == (5, 5)
+    assert len(avances) == workers
+    orden = ["station", "pollutant", "period"]
+    pd.testing.assert_frame_equal(
+        resultado.summary.astype({c: str for c in orden}),
+        esperado.summary.sort_values(orden, ignore_index=True).astype({c: str for c in orden}),
+    )
+    assert len(resultado.averages) == len(esperado.averages)
+
+
+def test_evaluate_network_desde_parquet_por_lotes(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from calidad_aire import lotes
+    from calidad_aire.ingesta import monitoring_source, unit_errors
+
+    rng = np.random.default_rng(2)
+    horas = pd.date_range("2024-01-01", periods=24 * 5, freq="h")
+    data = pd.concat([
+        pd.DataFrame({"timestamp": horas, "station": f"E{s}", "pollutant": "PM10",
+                      "value": rng.gamma(2.0, 60.0, len(horas)).round(2)})
+        for s in range(5)
+    ], ignore_index=True)
+    csv = tmp_path / "datos.csv"
+    data.to_csv(csv, index=False)
+    ruta = monitoring_source(csv, cache_dir=tmp_path / "cache")
+    assert unit_errors(ruta).empty
+
+    leidas = []
+    original = lotes.load_monitoring
+    monkeypatch.setattr(lotes, "ESTACIONES_POR_LOTE", 2)
+    monkeypatch.setattr(lotes, "load_monitoring",
+                        lambda path, **kw: leidas.append(kw.get("stations")) or original(path, **kw))
+    resultado = evaluate_network(ruta, ECA, max_workers=1)
+    assert [list(lote) for lote in leidas] == [["E0", "E1"], ["E2", "E3"], ["E4"]]
+    assert resultado.summary["n_exceed"].sum() == evaluate_compliance(data, ECA).summary["n_exceed"].sum()
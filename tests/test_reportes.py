@@ -0,0 +1,29 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.datos import ECA, NORMA_EXPLICACIONES
+from calidad_aire.reportes import generate_report, report_key
+
+
+@pytest.fixture
+def mediciones():
+    horas = pd.date_range("2023-01-01", periods=24 * 10, freq="h")
+    return pd.DataFrame({"timestamp": horas, "station": "A", "pollutant": "PM10",
+                         "value": np.full(len(horas), 30.0, dtype="float32")})
+
+
+def test_report_key_normaliza_el_periodo(mediciones):
+    clave = report_key("A", mediciones, ECA, NORMA_EXPLICACIONES, "2023-01-01", "2023-01-10")
+    assert clave == report_key("A", mediciones, ECA, NORMA_EXPLICACIONES,
+                               date(2023, 1, 1), pd.Timestamp("2023-01-10"))
+    assert clave != report_key("A", mediciones, ECA, NORMA_EXPLICACIONES, "2023-01-02", "2023-01-10")
+
+
+def test_reporte_con_periodo_en_texto(tmp_path, mediciones):
+    pytest.importorskip("fpdf")
+    destino = tmp_path / "reporte.pdf"
+    generate_report(destino, "A", mediciones, ECA, NORMA_EXPLICACIONES, start="2023-01-01", end="2023-01-10")
+    assert destino.read_bytes().startswith(b"%PDF")
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from calidad_aire.unidades import conversion_factor, molar_volume, normalize_unit, to_canonical
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("ug/m3", "µg/m³"), ("μg/m³", "µg/m³"), ("µg m-3", "µg/m³"), ("MG/M3", "mg/m³"),
+    ("ng/m³", "ng/m³"), (" ppb ", "ppb"),
+])
+def test_normalize_unit(texto, esperado):
+    assert normalize_unit(texto) == esperado
+
+
+def test_unidad_desconocida():
+    with pytest.raises(ValueError, match="no soportada"):
+        normalize_unit("furlong")
+
+
+def test_factores_de_masa():
+    assert conversion_factor("mg/m³", "µg/m³") == 1000.0
+    assert conversion_factor("ng/m³", "µg/m³") == pytest.approx(1e-3)
+    assert conversion_factor("µg/m³", "mg/m³") == pytest.approx(1e-3)
+
+
+def test_fracciones_molares_a_25_grados():
+    assert molar_volume() == pytest.approx(24.465, rel=1e-4)
+    assert conversion_factor("ppb", "µg/m³", "SO2") == pytest.approx(64.066 / 24.465, rel=1e-4)
+    assert conversion_factor("ppm", "mg/m³", "CO") == pytest.approx(1.145, rel=1e-3)
+    with pytest.raises(ValueError, match="peso molecular"):
+        conversion_factor("ppb", "µg/m³", "PM10")
+
+
+def test_to_canonical_por_fila():
+    valores = to_canonical([1.0, 1.0, 2.0], ["mg/m3", "ppb", "ug/m3"], ["CO", "NO2", "PM10"])
+    np.testing.assert_allclose(valores, [1000.0, 46.0055 / 24.465, 2.0], rtol=1e-4)
+
+
+def test_to_canonical_unidades_vacias_y_desconocidas():
+    valores = to_canonical([1.0, 1.0, 1.0, 1.0], [None, "", "furlong", np.nan], ["CO", "CO", "CO", "Xyz"],
+                           default_units={"CO": "mg/m³"}, errors="coerce")
+    np.testing.assert_allclose(valores, [1000.0, 1000.0, np.nan, np.nan])
+    with pytest.raises(ValueError, match="Falta la unidad"):
+        to_canonical([1.0], [None], ["CO"])
+
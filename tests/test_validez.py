@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calidad_aire.validez import UMBRAL_COMPLETITUD, completeness, min_hours
+
+
+def _grid(horas, valores):
+    columnas = pd.MultiIndex.from_tuples([("A", "SO2")], names=["station", "pollutant"])
+    return pd.DataFrame({columnas[0]: valores}, index=horas).set_axis(columnas, axis=1)
+
+
+@pytest.mark.parametrize("period, hours, esperado", [
+    ("1h", None, 1), ("8h", None, 6), ("24h", None, 18), ("anual", None, 6570), ("anual", 8784, 6588),
+])
+def test_horas_minimas(period, hours, esperado):
+    assert min_hours(period, hours=hours) == esperado
+
+
+def test_completitud_8h_en_el_limite():
+    horas = pd.date_range("2024-01-01", periods=10, freq="h")
+    valores = np.array([1, 1, np.nan, 1, 1, np.nan, 1, 1, 1, 1], dtype=float)
+    grid = _grid(horas, valores)
+    fraccion = completeness(grid, "8h")[("A", "SO2")].to_numpy()
+    np.testing.assert_allclose(fraccion[6:], [5 / 8, 6 / 8, 6 / 8, 6 / 8])
+    # 6 de 8 h alcanza exactamente el 75 %
+    assert fraccion[7] >= UMBRAL_COMPLETITUD > fraccion[6]
+
+
+def test_completitud_diaria_y_anual():
+    horas = pd.date_range("2024-01-01", "2024-01-02 23:00", freq="h")
+    valores = np.where(horas.day == 1, 1.0, np.nan)
+    valores[24:42] = 1.0  # 18 h el segundo día
+    grid = _grid(horas, valores)
+    np.testing.assert_allclose(completeness(grid, "24h")[("A", "SO2")], [1.0, 0.75])
+    # 2024 es bisiesto: 42 h de 8784
+    assert completeness(grid, "anual").iloc[0, 0] == pytest.approx(42 / 8784)
+    with pytest.raises(ValueError):
+        completeness(grid, "mensual")